@@ -0,0 +1,56 @@
+"""
+Sequential requests versus `Session.batch()` against the stdio echo server.
+
+Simulates an agent step calling several tools at once: each round issues
+CALLS tool calls and waits for all results. "sequential" awaits each call
+before the next, "pipelined" uses a batch on a transport without
+`batch_requests`, and "batched" writes each round as one JSON-RPC array.
+
+Run from the repository root:
+    python -m benchmarks.bench_batch [--rounds 200] [--calls 8]
+"""
+from src.mcp.client.service import MCPClient
+from src.mcp.types.tools import CallToolRequestParams
+import argparse
+import asyncio
+import sys
+import time
+
+SERVER = "benchmarks/servers/echo_server.py"
+
+
+async def run(mode: str, rounds: int, calls: int) -> float:
+    client = MCPClient.from_config({"mcpServers": {"echo": {
+        "command": sys.executable,
+        "args": [SERVER],
+        "batch_requests": mode == "batched",
+    }}})
+    session = await client.create_session("echo")
+    params = [CallToolRequestParams(name="echo", arguments={"text": str(i)}) for i in range(calls)]
+    start = time.perf_counter()
+    for _ in range(rounds):
+        if mode == "sequential":
+            results = [await session.tools_call(p) for p in params]
+        else:
+            async with session.batch() as batch:
+                handles = [batch.add(session.tools_call, p) for p in params]
+            results = [await handle for handle in handles]
+        assert [result.content[0].text for result in results] == [str(i) for i in range(calls)]
+    elapsed = time.perf_counter() - start
+    await client.close_all_sessions()
+    return elapsed
+
+
+async def main(rounds: int, calls: int) -> None:
+    print(f"{rounds} rounds of {calls} tool calls")
+    for mode in ("sequential", "pipelined", "batched"):
+        elapsed = await run(mode, rounds, calls)
+        print(f"{mode:<12} {elapsed * 1e3 / rounds:8.3f} ms/round")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--calls", type=int, default=8)
+    args = parser.parse_args()
+    asyncio.run(main(args.rounds, args.calls))
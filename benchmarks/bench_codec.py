@@ -0,0 +1,82 @@
+"""
+Codec comparison for `tools/call` round-trips.
+
+Each round encodes a CallToolRequest, decodes a CallToolResult response body
+and builds the response envelope, as the transports do per call. The legacy
+row reproduces the previous `model_dump` -> `json.dumps` -> `.encode()` and
+`json.loads` -> `model_validate` path. Codecs whose package is not installed
+are skipped.
+
+Run from the repository root:
+    python -m benchmarks.bench_codec
+"""
+from src.mcp.transport.codec import CODECS, get_codec
+from src.mcp.types.json_rpc import JSONRPCResultResponse
+from src.mcp.types.tools import CallToolRequest, CallToolRequestParams
+from benchmarks.loopback import LoopbackTransport
+import asyncio
+import json
+import time
+
+ITERATIONS = 20_000
+CONCURRENCY = 2_000
+
+REQUEST = CallToolRequest(id=1, params=CallToolRequestParams(
+    name="search",
+    arguments={"query": "model context protocol", "limit": 25, "filters": {"lang": ["en", "de"], "year": 2025}},
+))
+RESPONSE = json.dumps({
+    "jsonrpc": "2.0",
+    "id": 1,
+    "result": {
+        "content": [{"type": "text", "text": f"result line {i} " * 8} for i in range(20)],
+        "isError": False,
+    },
+}).encode()
+
+
+def legacy_round_trip() -> None:
+    json.dumps(REQUEST.model_dump(by_alias=True)).encode()
+    JSONRPCResultResponse.model_validate(json.loads(RESPONSE.decode()))
+
+
+def codec_round_trip(codec) -> None:
+    codec.encode(REQUEST)
+    JSONRPCResultResponse.model_construct(**codec.decode(RESPONSE))
+
+
+def measure(fn, *args) -> float:
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        fn(*args)
+    return (time.perf_counter() - start) / ITERATIONS
+
+
+async def loopback(codec_name: str) -> float:
+    transport = LoopbackTransport(codec=codec_name)
+    params = REQUEST.params
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        transport.send_request(CallToolRequest(id=transport.next_request_id(), params=params))
+        for _ in range(CONCURRENCY)
+    ))
+    elapsed = time.perf_counter() - start
+    await transport.disconnect()
+    return elapsed / CONCURRENCY
+
+
+def main() -> None:
+    print(f"{'codec':<10} {'encode+decode':>16} {'loopback call':>16}")
+    print(f"{'legacy':<10} {measure(legacy_round_trip) * 1e6:13.2f} us {'-':>16}")
+    for name in CODECS:
+        try:
+            codec = get_codec(name)
+        except ImportError:
+            print(f"{name:<10} {'not installed':>16}")
+            continue
+        per_call = asyncio.run(loopback(name))
+        print(f"{name:<10} {measure(codec_round_trip, codec) * 1e6:13.2f} us {per_call * 1e6:13.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Per-request correlation overhead with 10k requests in flight.
+
+Compares the previous per-transport pattern (uuid4 string ids, a plain dict of
+futures keyed by whatever id the server echoes) with `RequestCorrelator`.
+
+Run from the repository root:
+    python -m benchmarks.bench_correlation
+"""
+from src.mcp.transport.base import RequestCorrelator
+from benchmarks.loopback import LoopbackTransport
+from src.mcp.types.tools import CallToolRequest, CallToolRequestParams
+from uuid import uuid4
+import asyncio
+import random
+import time
+
+IN_FLIGHT = 10_000
+ROUNDS = 20
+
+
+async def legacy_round() -> float:
+    loop = asyncio.get_running_loop()
+    pending: dict[str, asyncio.Future] = {}
+    start = time.perf_counter()
+    ids = []
+    for _ in range(IN_FLIGHT):
+        request_id = str(uuid4())
+        pending[request_id] = loop.create_future()
+        ids.append(request_id)
+    random.shuffle(ids)
+    for request_id in ids:
+        future = pending.pop(request_id, None)
+        if future and not future.done():
+            future.set_result(None)
+    return time.perf_counter() - start
+
+
+async def correlator_round() -> float:
+    correlator = RequestCorrelator()
+    start = time.perf_counter()
+    ids = []
+    for _ in range(IN_FLIGHT):
+        request_id = correlator.next_id()
+        correlator.register(request_id)
+        ids.append(request_id)
+    random.shuffle(ids)
+    for request_id in ids:
+        correlator.resolve(request_id, None)
+    return time.perf_counter() - start
+
+
+async def end_to_end_round() -> float:
+    transport = LoopbackTransport()
+    params = CallToolRequestParams(name="add", arguments={"a": 1, "b": 2})
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        transport.send_request(CallToolRequest(id=transport.next_request_id(), params=params))
+        for _ in range(IN_FLIGHT)
+    ))
+    elapsed = time.perf_counter() - start
+    await transport.disconnect()
+    return elapsed
+
+
+def report(name: str, samples: list[float]) -> None:
+    best = min(samples)
+    print(f"{name:<28} {best * 1e3:8.2f} ms/round  {best / IN_FLIGHT * 1e9:8.0f} ns/request")
+
+
+async def main() -> None:
+    print(f"{IN_FLIGHT} in-flight requests, best of {ROUNDS} rounds")
+    report("legacy uuid4 + dict", [await legacy_round() for _ in range(ROUNDS)])
+    report("RequestCorrelator", [await correlator_round() for _ in range(ROUNDS)])
+    report("send_request (loopback)", [await end_to_end_round() for _ in range(3)])
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
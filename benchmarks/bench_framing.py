@@ -0,0 +1,76 @@
+"""
+Framing of large newline-delimited messages (1 MB and 50 MB).
+
+`LineFramer` is compared with the previous split-the-whole-buffer approach,
+which rescans everything received so far on every chunk. The end-to-end rows
+fetch a blob of the same size from a stdio server, which used to fail with
+`LimitOverrunError` above 64 KiB.
+
+Run from the repository root:
+    python -m benchmarks.bench_framing
+"""
+from src.mcp.transport.framing import LineFramer
+from src.mcp.client.service import MCPClient
+from src.mcp.types.tools import CallToolRequestParams
+import asyncio
+import sys
+import time
+
+CHUNK = 256 * 1024
+SIZES = {"1 MB": 1_000_000, "50 MB": 50_000_000}
+
+
+def naive_split(chunks: list[bytes]) -> int:
+    buffer = bytearray()
+    count = 0
+    for chunk in chunks:
+        buffer.extend(chunk)
+        if b"\n" in buffer:
+            parts = buffer.split(b"\n")
+            buffer = parts.pop()
+            count += len(parts)
+    return count
+
+
+def framed(chunks: list[bytes]) -> int:
+    framer = LineFramer()
+    return sum(len(framer.feed(chunk)) for chunk in chunks)
+
+
+def chunked(size: int) -> list[bytes]:
+    payload = b'{"jsonrpc":"2.0","id":1,"result":{"text":"' + b"x" * size + b'"}}\n'
+    return [payload[i:i + CHUNK] for i in range(0, len(payload), CHUNK)]
+
+
+def measure(fn, chunks: list[bytes]) -> float:
+    start = time.perf_counter()
+    assert fn(chunks) == 1
+    return time.perf_counter() - start
+
+
+async def end_to_end() -> dict[str, float]:
+    client = MCPClient.from_config({"mcpServers": {"echo": {
+        "command": sys.executable,
+        "args": ["benchmarks/servers/echo_server.py"],
+    }}})
+    session = await client.create_session("echo")
+    timings = {}
+    for label, size in SIZES.items():
+        start = time.perf_counter()
+        result = await session.tools_call(CallToolRequestParams(name="blob", arguments={"size": size}), result_mode="raw")
+        timings[label] = time.perf_counter() - start
+        assert len(result["content"][0]["text"]) == size
+    await client.close_session("echo")
+    return timings
+
+
+def main() -> None:
+    print(f"{'size':<8} {'naive split':>12} {'LineFramer':>12} {'stdio call':>12}")
+    calls = asyncio.run(end_to_end())
+    for label, size in SIZES.items():
+        chunks = chunked(size)
+        print(f"{label:<8} {measure(naive_split, chunks) * 1e3:9.1f} ms {measure(framed, chunks) * 1e3:9.1f} ms {calls[label] * 1e3:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Throughput of a single-threaded stdio server with one or more replicas.
+
+The echo server answers one request at a time, so CALLS concurrent calls of
+its `sleep` tool queue up behind each other in a single process. With
+`replicas` > 1 the pooled transport spreads them over several processes,
+routing each call to the replica with the fewest calls in flight.
+
+`sleep` stands in for a tool that blocks its server on I/O. CPU-bound tools
+only scale up to the number of cores of the machine.
+
+Run from the repository root:
+    python -m benchmarks.bench_replicas [--calls 200] [--seconds 0.01] [--replicas 1 2 4]
+"""
+from src.mcp.client.utils import create_transport_from_server_config
+from src.mcp.types.tools import CallToolRequestParams
+from src.mcp.types.info import Implementation
+from src.mcp.client.session import Session
+import argparse
+import asyncio
+import sys
+import time
+
+SERVER = "benchmarks/servers/echo_server.py"
+
+
+async def run(replicas: int, calls: int, seconds: float) -> float:
+    transport = create_transport_from_server_config({"command": sys.executable, "args": [SERVER], "replicas": replicas})
+    session = Session(transport, Implementation(name="bench", version="1.0.0"))
+    await session.connect()
+    await session.initialize()
+    start = time.perf_counter()
+    results = await asyncio.gather(*(
+        session.tools_call(CallToolRequestParams(name="sleep", arguments={"seconds": seconds}))
+        for _ in range(calls)
+    ))
+    elapsed = time.perf_counter() - start
+    assert all(result.content[0].text == "slept" for result in results)
+    await session.shutdown()
+    return elapsed
+
+
+async def main(calls: int, seconds: float, replicas: list[int]) -> None:
+    print(f"{calls} concurrent calls of sleep({seconds})")
+    for count in replicas:
+        elapsed = await run(count, calls, seconds)
+        print(f"replicas={count:<3} {calls / elapsed:8.1f} calls/s {elapsed:7.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--seconds", type=float, default=0.01)
+    parser.add_argument("--replicas", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+    asyncio.run(main(args.calls, args.seconds, args.replicas))
@@ -0,0 +1,72 @@
+"""
+Response latency while server-initiated sampling requests are in progress.
+
+The server sends `sampling/createMessage` requests whose callback takes
+SAMPLING_DELAY seconds, then the client issues pings on the same connection.
+With inline handling the read loop waits for each callback before delivering
+the next message; with task dispatch ping latency stays flat.
+
+Run from the repository root:
+    python -m benchmarks.bench_server_requests
+"""
+from src.mcp.transport.base import BaseTransport
+from src.mcp.types.json_rpc import JSONRPCRequest
+from src.mcp.types.ping import PingRequest
+from src.mcp.types.sampling import CreateMessageResult
+from src.mcp.types.content import TextContent
+from benchmarks.loopback import LoopbackTransport
+import asyncio
+import statistics
+import time
+
+SAMPLING_DELAY = 0.5
+SAMPLING_REQUESTS = 4
+PINGS = 50
+
+
+class InlineLoopbackTransport(LoopbackTransport):
+    """Previous behaviour: server requests are awaited on the read loop."""
+
+    async def dispatch(self, content):
+        if "method" in content and "id" in content:
+            await BaseTransport.serve_request(self, JSONRPCRequest.model_validate(content))
+        else:
+            await super().dispatch(content)
+
+
+async def sampling_callback(params) -> CreateMessageResult:
+    await asyncio.sleep(SAMPLING_DELAY)
+    return CreateMessageResult(role="assistant", content=TextContent(text="ok"), model="bench")
+
+
+async def run(transport: LoopbackTransport) -> list[float]:
+    transport.attach_callbacks({"sampling": sampling_callback})
+    await transport.connect()
+    for i in range(SAMPLING_REQUESTS):
+        transport.inject({
+            "jsonrpc": "2.0", "id": f"s{i}", "method": "sampling/createMessage",
+            "params": {"messages": [{"role": "user", "content": {"type": "text", "text": "hi"}}], "maxTokens": 10},
+        })
+    await asyncio.sleep(0)
+
+    latencies = []
+    for _ in range(PINGS):
+        start = time.perf_counter()
+        await transport.send_request(PingRequest(id=transport.next_request_id()))
+        latencies.append(time.perf_counter() - start)
+    await transport.disconnect()
+    return latencies
+
+
+def report(name: str, latencies: list[float]) -> None:
+    print(f"{name:<16} p50 {statistics.median(latencies) * 1e3:8.2f} ms   max {max(latencies) * 1e3:8.2f} ms")
+
+
+async def main() -> None:
+    print(f"{PINGS} pings during {SAMPLING_REQUESTS} sampling callbacks of {SAMPLING_DELAY}s each")
+    report("inline", await run(InlineLoopbackTransport()))
+    report("task dispatch", await run(LoopbackTransport()))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
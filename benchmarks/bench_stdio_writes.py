@@ -0,0 +1,108 @@
+"""
+Stdin writes for many concurrent calls to a stdio server.
+
+Issues CALLS concurrent tool calls against the echo server and counts the
+`os.write` syscalls on the server's stdin pipe. "direct" is the behaviour
+before the writer, where every sender writes and drains on its own;
+"writer queue" sends every message through the single writer task, which
+coalesces everything queued since its last write; "stdio" is the
+transport as shipped, writing directly while the pipe keeps up and queueing
+only once it is behind.
+
+Always queueing cuts the number of writes but holds the first message back
+until every sender has queued, so the server cannot start working while the
+client is still writing.
+
+Run from the repository root:
+    python -m benchmarks.bench_stdio_writes [--calls 1000] [--repeat 5]
+"""
+from src.mcp.transport.stdio import StdioTransport
+from src.mcp.types.stdio import StdioServerParams
+from src.mcp.types.tools import CallToolRequestParams
+from src.mcp.types.info import Implementation
+from src.mcp.client.session import Session
+from src.mcp.types.json_rpc import JSONRPCMessage
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+SERVER = "benchmarks/servers/echo_server.py"
+
+
+class DirectStdioTransport(StdioTransport):
+    """Previous behaviour: each sender writes and drains stdin itself."""
+
+    async def send_message(self, message: JSONRPCMessage) -> None:
+        self.process.stdin.write(self.codec.encode(message) + b"\n")
+        await self.process.stdin.drain()
+
+
+class QueuedStdioTransport(StdioTransport):
+    """Every message goes through the writer task."""
+
+    def write_line(self, data: bytes) -> bool:
+        return False
+
+
+class WriteCounter:
+    """Counts `os.write` calls on a single file descriptor."""
+
+    def __init__(self) -> None:
+        self.fd = None
+        self.count = 0
+        self._write = os.write
+
+    def __enter__(self) -> "WriteCounter":
+        def write(fd, data):
+            if fd == self.fd:
+                self.count += 1
+            return self._write(fd, data)
+        os.write = write
+        return self
+
+    def __exit__(self, *exc) -> None:
+        os.write = self._write
+
+
+async def run(transport_class: type[StdioTransport], calls: int) -> tuple[float, float, int]:
+    transport = transport_class(StdioServerParams(command=sys.executable, args=[SERVER]))
+    session = Session(transport, Implementation(name="bench", version="1.0.0"))
+    await session.connect()
+    await session.initialize()
+    with WriteCounter() as counter:
+        counter.fd = transport.process.stdin.get_extra_info("pipe").fileno()
+        start = time.perf_counter()
+        cpu_start = time.process_time()
+        results = await asyncio.gather(*(
+            session.tools_call(CallToolRequestParams(name="echo", arguments={"text": str(i)}))
+            for i in range(calls)
+        ))
+        elapsed = time.perf_counter() - start
+        cpu = time.process_time() - cpu_start
+    assert all(result.content[0].text == str(i) for i, result in enumerate(results))
+    await session.shutdown()
+    return elapsed, cpu, counter.count
+
+
+async def main(calls: int, repeat: int) -> None:
+    print(f"{calls} concurrent tool calls, best of {repeat}")
+    variants = {"direct": DirectStdioTransport, "writer queue": QueuedStdioTransport, "stdio": StdioTransport}
+    runs = {name: [] for name in variants}
+    # Rounds alternate the variants so drift in machine load hits all of them alike
+    for _ in range(repeat):
+        for name, transport_class in variants.items():
+            runs[name].append(await run(transport_class, calls))
+    for name in variants:
+        elapsed, _, writes = min(runs[name])
+        cpu = min(cpu for _, cpu, _ in runs[name])
+        print(f"{name:<14} {calls / elapsed:8.0f} calls/s {cpu / calls * 1e6:6.1f} us client CPU/call {writes:6d} stdin writes")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.calls, args.repeat))
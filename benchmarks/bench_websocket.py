@@ -0,0 +1,67 @@
+"""
+WebSocket transport throughput for small and large messages.
+
+An in-process `websockets` server echoes every request's params back as its
+result, so the client sends and receives payloads of the same size. Each
+configuration issues CONCURRENCY requests at a time through the writer queue
+and reports messages and megabytes per second. Large payloads are 2 MiB,
+above the 1 MiB default `max_size` of the websockets library.
+
+Run from the repository root:
+    python -m benchmarks.bench_websocket
+"""
+from src.mcp.transport.websocket import WebSocketTransport
+from src.mcp.types.json_rpc import JSONRPCRequest
+from websockets.asyncio.server import serve
+import asyncio
+import json
+import time
+
+CONCURRENCY = 32
+SIZES = {"small (100 B)": (100, 5000), "large (2 MiB)": (2 * 1024 * 1024, 100)}
+CONFIGS = {
+    "no compression": {"compression": None},
+    "deflate": {"compression": "deflate"},
+    "deflate level 1": {"compression": "deflate", "compression_level": 1},
+}
+
+
+async def echo(websocket) -> None:
+    async for data in websocket:
+        message = json.loads(data)
+        if "id" in message and "method" in message:
+            await websocket.send(json.dumps({"jsonrpc": "2.0", "id": message["id"], "result": message.get("params", {})}))
+
+
+async def run(url: str, size: int, count: int, options: dict) -> tuple[float, float]:
+    transport = WebSocketTransport(url, **options)
+    await transport.connect()
+    # Random-looking text so compression has realistic work to do
+    payload = (bytes(range(33, 127)) * (size // 94 + 1)).decode()[:size]
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def call() -> None:
+        async with semaphore:
+            request = JSONRPCRequest(id=transport.next_request_id(), method="echo", params={"data": payload})
+            await transport.send_request(request)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(call() for _ in range(count)))
+    elapsed = time.perf_counter() - start
+    await transport.disconnect()
+    return count / elapsed, 2 * size * count / elapsed / 1e6
+
+
+async def main() -> None:
+    async with serve(echo, "127.0.0.1", 0, max_size=None, subprotocols=["mcp"]) as server:
+        port = server.sockets[0].getsockname()[1]
+        url = f"ws://127.0.0.1:{port}"
+        for size_name, (size, count) in SIZES.items():
+            print(f"{size_name}, {count} requests, {CONCURRENCY} in flight")
+            for config_name, options in CONFIGS.items():
+                rate, throughput = await run(url, size, count, options)
+                print(f"  {config_name:<16} {rate:10.0f} msg/s {throughput:10.1f} MB/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
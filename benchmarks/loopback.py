@@ -0,0 +1,57 @@
+"""
+In-process transport used by the benchmarks.
+
+`LoopbackTransport` answers every request through a handler coroutine on the
+same event loop, so benchmarks measure client-side overhead only. Messages
+still go through the transport codec in both directions, as on a real wire,
+and inbound messages are delivered by a single reader task like the read loop
+of the real transports.
+"""
+from src.mcp.transport.base import BaseTransport
+from src.mcp.types.json_rpc import JSONRPCMessage
+from typing import Any, Awaitable, Callable, Optional
+import asyncio
+
+Handler = Callable[[dict[str, Any]], Awaitable[Optional[dict[str, Any]]]]
+
+
+async def echo_handler(message: dict[str, Any]) -> Optional[dict[str, Any]]:
+    if "id" not in message or "method" not in message:
+        return None
+    return {"jsonrpc": "2.0", "id": message["id"], "result": {"content": [], "isError": False}}
+
+
+class LoopbackTransport(BaseTransport):
+    def __init__(self, handler: Handler = echo_handler, **kwargs):
+        super().__init__(**kwargs)
+        self.handler = handler
+        self.inbox: asyncio.Queue[bytes] = asyncio.Queue()
+        self.listen_task: Optional[asyncio.Task] = None
+
+    async def connect(self) -> None:
+        self.listen_task = asyncio.create_task(self.listen())
+
+    async def disconnect(self) -> None:
+        if self.listen_task:
+            self.listen_task.cancel()
+            self.listen_task = None
+        self.cancel_inflight()
+
+    async def send_message(self, message: JSONRPCMessage) -> None:
+        if self.listen_task is None:
+            await self.connect()
+        data = self.codec.encode(message)
+        asyncio.get_running_loop().create_task(self._reply(data))
+
+    def inject(self, content: dict[str, Any]) -> None:
+        """Deliver a server-initiated message."""
+        self.inbox.put_nowait(self.codec.dumps(content))
+
+    async def _reply(self, data: bytes) -> None:
+        reply = await self.handler(self.codec.decode(data))
+        if reply is not None:
+            self.inject(reply)
+
+    async def listen(self) -> None:
+        while True:
+            await self.dispatch(self.codec.decode(await self.inbox.get()))
@@ -0,0 +1,88 @@
+"""
+Minimal stdio MCP server used by the benchmarks and stress tests.
+
+Only depends on the standard library so it starts fast and behaves the same
+on every machine. Tools:
+    echo(text): returns text
+    blob(size): returns a text block of `size` bytes
+    sleep(seconds): waits, then returns "slept" (annotated read-only)
+
+JSON-RPC batch arrays are answered with an array of responses.
+
+Options:
+    --stderr-mb N   write N MiB of log lines to stderr in the background
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+
+def respond(request_id, result) -> dict:
+    return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+def chatter(megabytes: int) -> None:
+    line = ("stderr noise " * 8).strip() + "\n"
+    written = 0
+    while written < megabytes * 1024 * 1024:
+        sys.stderr.write(line)
+        written += len(line)
+    sys.stderr.flush()
+
+def call_tool(params: dict) -> dict:
+    arguments = params.get("arguments") or {}
+    match params.get("name"):
+        case "echo":
+            text = str(arguments.get("text", ""))
+        case "blob":
+            text = "x" * int(arguments.get("size", 0))
+        case "sleep":
+            time.sleep(float(arguments.get("seconds", 0)))
+            text = "slept"
+        case name:
+            return {"content": [{"type": "text", "text": f"Unknown tool: {name}"}], "isError": True}
+    return {"content": [{"type": "text", "text": text}], "isError": False}
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stderr-mb", type=int, default=0)
+    args = parser.parse_args()
+    if args.stderr_mb:
+        threading.Thread(target=chatter, args=(args.stderr_mb,), daemon=True).start()
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        message = json.loads(line)
+        if isinstance(message, list):
+            reply = [response for item in message if (response := handle(item)) is not None] or None
+        else:
+            reply = handle(message)
+        if reply is not None:
+            sys.stdout.write(json.dumps(reply) + "\n")
+            sys.stdout.flush()
+
+def handle(message: dict) -> dict | None:
+    if "id" not in message or "method" not in message:
+        return None
+    match message["method"]:
+        case "initialize":
+            return respond(message["id"], {
+                "protocolVersion": "2024-11-05",
+                "capabilities": {"tools": {}},
+                "serverInfo": {"name": "echo-server", "version": "1.0.0"},
+            })
+        case "tools/list":
+            return respond(message["id"], {"tools": [
+                {"name": "echo", "inputSchema": {"type": "object", "properties": {"text": {"type": "string"}}}},
+                {"name": "blob", "inputSchema": {"type": "object", "properties": {"size": {"type": "integer"}}}},
+                {"name": "sleep", "inputSchema": {"type": "object", "properties": {"seconds": {"type": "number"}}},
+                 "annotations": {"readOnlyHint": True}},
+            ]})
+        case "tools/call":
+            return respond(message["id"], call_tool(message.get("params") or {}))
+        case _:
+            return respond(message["id"], {})
+
+if __name__ == "__main__":
+    main()
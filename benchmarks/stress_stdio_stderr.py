@@ -0,0 +1,50 @@
+"""
+Stress test: a stdio server writing megabytes to stderr while serving calls.
+
+Without a stderr reader the server blocks once the ~64 KiB pipe buffer fills
+and every call times out. With the drain all calls complete and only the last
+`stderr_lines` lines are retained.
+
+Run from the repository root:
+    python -m benchmarks.stress_stdio_stderr [--stderr-mb 32] [--calls 2000]
+"""
+from src.mcp.client.service import MCPClient
+from src.mcp.types.tools import CallToolRequestParams
+import argparse
+import asyncio
+import sys
+import time
+
+SERVER = "benchmarks/servers/echo_server.py"
+
+
+async def main(stderr_mb: int, calls: int) -> None:
+    client = MCPClient.from_config({"mcpServers": {"chatty": {
+        "command": sys.executable,
+        "args": [SERVER, "--stderr-mb", str(stderr_mb)],
+        "stderr_lines": 500,
+    }}})
+    session = await client.create_session("chatty")
+    start = time.perf_counter()
+    results = await asyncio.gather(*(
+        session.tools_call(CallToolRequestParams(name="echo", arguments={"text": str(i)}))
+        for i in range(calls)
+    ))
+    elapsed = time.perf_counter() - start
+    assert all(result.content[0].text == str(i) for i, result in enumerate(results))
+    # Give the server time to finish its stderr burst, then check it is still responsive
+    await asyncio.sleep(1)
+    assert await session.ping()
+    stderr = session.get_stderr()
+    await client.close_session("chatty")
+
+    print(f"{calls} calls with {stderr_mb} MiB of stderr: {elapsed:.2f} s ({calls / elapsed:.0f} calls/s)")
+    print(f"stderr ring buffer holds {len(stderr)} lines, last: {stderr[-1]!r}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stderr-mb", type=int, default=32)
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(main(args.stderr_mb, args.calls))
@@ -0,0 +1,78 @@
+from src.mcp.transport.base import MessageBatch, current_batch
+from src.mcp.client.handle import RequestHandle
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, TypeVar
+import asyncio
+
+if TYPE_CHECKING:
+    from src.mcp.client.session import Session
+
+T = TypeVar("T")
+
+
+class RequestBatch:
+    """
+    Requests of a Session sent to the server together, created by `Session.batch()`.
+
+    Requests added with `add` start right away but are held back until the
+    `async with` block exits, then written as one JSON-RPC array when the
+    transport has `batch_requests` enabled, or back to back otherwise.
+    Each request keeps its own handle, timeout and result.
+
+        async with session.batch() as batch:
+            tools = batch.add(session.tools_list)
+            prompts = batch.add(session.prompts_list)
+        print((await tools).tools, (await prompts).prompts)
+    """
+
+    def __init__(self, session: "Session") -> None:
+        self.session = session
+        self.collector = MessageBatch(session.transport)
+        self.handles: list[RequestHandle] = []
+
+    def add(self, method: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> RequestHandle[T]:
+        '''
+        Add a request to the batch
+
+        Args:
+            method: A bound request method, e.g. `session.tools_call`
+            *args: Positional arguments for the method
+            **kwargs: Keyword arguments for the method
+
+        Returns:
+            A handle resolving to the result once the batch was sent
+        '''
+        token = current_batch.set(self.collector)
+        try:
+            handle = self.session.spawn(method, *args, **kwargs)
+        finally:
+            current_batch.reset(token)
+        self.handles.append(handle)
+        return handle
+
+    async def flush(self) -> None:
+        """Send the requests added so far."""
+        # Let every request reach the transport, or finish before it
+        while True:
+            collected = {message.id for message in self.collector.messages}
+            waiting = [handle.task for handle in self.handles if not handle.done() and handle.request_id not in collected]
+            if not waiting:
+                break
+            self.collector.added.clear()
+            added = asyncio.ensure_future(self.collector.added.wait())
+            try:
+                await asyncio.wait([added, *waiting], return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                added.cancel()
+        messages, self.collector.messages = self.collector.messages, []
+        self.handles = []
+        await self.session.transport.send_batch(messages)
+
+    async def __aenter__(self) -> "RequestBatch":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            for handle in self.handles:
+                handle.cancel()
+            return
+        await self.flush()
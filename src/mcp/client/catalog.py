@@ -0,0 +1,201 @@
+from src.mcp.types.capabilities import ServerCapabilities
+from src.mcp.types.json_rpc import Method
+from src.mcp.logger import get_logger
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Optional
+import asyncio
+
+logger = get_logger(__name__)
+
+CATALOG_METHODS = {
+    Method.TOOLS_LIST: "tools",
+    Method.PROMPTS_LIST: "prompts",
+    Method.RESOURCES_LIST: "resources",
+    Method.RESOURCES_TEMPLATES_LIST: "resources",
+}
+"""List methods that can be cached, with the server capability advertising their `listChanged`."""
+
+CATALOG_ITEMS = {
+    Method.TOOLS_LIST: "tools",
+    Method.PROMPTS_LIST: "prompts",
+    Method.RESOURCES_LIST: "resources",
+    Method.RESOURCES_TEMPLATES_LIST: "resourceTemplates",
+}
+"""The result field holding the items of each list method."""
+
+LIST_CHANGED = {
+    Method.NOTIFICATION_TOOLS_LIST_CHANGED: (Method.TOOLS_LIST,),
+    Method.NOTIFICATION_PROMPTS_LIST_CHANGED: (Method.PROMPTS_LIST,),
+    Method.NOTIFICATION_RESOURCES_LIST_CHANGED: (Method.RESOURCES_LIST, Method.RESOURCES_TEMPLATES_LIST),
+}
+"""The cached lists made stale by each list_changed notification."""
+
+
+@dataclass
+class CatalogPolicy:
+    """
+    How a Session caches the tool, prompt and resource lists of its server.
+
+    A stale list is fetched again in the background `debounce` seconds
+    after the last list_changed notification when `refresh` is set, or on
+    the next call otherwise.
+    """
+    refresh: bool = True
+    debounce: float = 0.5
+
+    @classmethod
+    def from_config(cls, config: bool | dict[str, Any] | None) -> Optional['CatalogPolicy']:
+        '''
+        Build a policy from the `catalog_cache` entry of a server configuration
+
+        Args:
+            config: True or None for the default policy, a dict of policy fields, or False to disable
+
+        Returns:
+            The policy, or None if lists are always fetched from the server
+        '''
+        if config is False:
+            return None
+        if config is None or config is True:
+            return cls()
+        return cls(**config)
+
+
+@dataclass
+class CatalogEntry:
+    result: dict[str, Any]
+    parsed: dict[str, Any] = field(default_factory=dict)
+
+
+class CatalogCache:
+    """
+    The first page of each list method of a session, kept until the server
+    says it changed.
+
+    Only lists whose capability advertised `listChanged` in the initialize
+    result are cached, since nothing else would tell the cache they are
+    stale. Concurrent misses share a single request. A notification makes
+    the list stale at once; a request already in flight when it arrived is
+    not cached, and the debounced refresh absorbs notification storms.
+
+    Cached results are shared between callers and must not be modified.
+    """
+
+    def __init__(self, policy: CatalogPolicy, fetch: Callable[[str], Awaitable[dict[str, Any]]]) -> None:
+        self.policy = policy
+        self.fetch = fetch
+        self.cacheable: set[str] = set()
+        self.entries: dict[str, CatalogEntry] = {}
+        self.loading: dict[str, asyncio.Task] = {}
+        self.refresh_tasks: dict[str, asyncio.Task] = {}
+        self.generations: dict[str, int] = {method: 0 for method in CATALOG_METHODS}
+        self.hits = 0
+        self.misses = 0
+
+    def configure(self, capabilities: Optional[ServerCapabilities], keep_entries: bool = False) -> None:
+        '''
+        Start over for a freshly initialized server
+
+        Args:
+            capabilities: The server capabilities from the initialize result
+            keep_entries: Keep the cached lists, when they are known to come from the same server
+        '''
+        if not keep_entries:
+            self.clear()
+        self.cacheable = set()
+        for method, name in CATALOG_METHODS.items():
+            capability = getattr(capabilities, name, None) if capabilities else None
+            if capability is not None and capability.listChanged:
+                self.cacheable.add(method)
+        for method in list(self.entries):
+            if method not in self.cacheable:
+                del self.entries[method]
+
+    def seed(self, method: str, result: dict[str, Any], generation: Optional[int] = None) -> None:
+        '''
+        Cache a list obtained some other way, e.g. from a snapshot
+
+        Args:
+            method: The list method
+            result: Its result
+            generation: The generation the result was fetched in; it is dropped if the list changed since
+        '''
+        if method not in self.cacheable:
+            return
+        if generation is not None and generation != self.generations[method]:
+            return
+        self.entries[method] = CatalogEntry(result)
+
+    def is_cacheable(self, method: str) -> bool:
+        return method in self.cacheable
+
+    async def get(self, method: str) -> CatalogEntry:
+        '''
+        Return the cached list, fetching it on a miss
+
+        Args:
+            method: A cacheable list method
+
+        Returns:
+            The entry holding the raw result and its parsed forms
+        '''
+        entry = self.entries.get(method)
+        if entry is not None:
+            self.hits += 1
+            return entry
+        task = self.loading.get(method)
+        if task is None:
+            self.misses += 1
+            task = self.loading[method] = asyncio.create_task(self.load(method))
+        else:
+            self.hits += 1
+        # One caller giving up must not cancel the request the others wait for
+        return await asyncio.shield(task)
+
+    async def load(self, method: str) -> CatalogEntry:
+        generation = self.generations[method]
+        try:
+            entry = CatalogEntry(await self.fetch(method))
+        finally:
+            if self.loading.get(method) is asyncio.current_task():
+                del self.loading[method]
+        if self.generations[method] == generation:
+            self.entries[method] = entry
+        return entry
+
+    def list_changed(self, notification: str) -> None:
+        '''
+        Mark the lists named by a list_changed notification stale
+
+        Args:
+            notification: The notification method
+        '''
+        for method in LIST_CHANGED.get(notification, ()):
+            if method not in self.cacheable:
+                continue
+            self.generations[method] += 1
+            self.entries.pop(method, None)
+            # A load started before the notification may return the old list
+            self.loading.pop(method, None)
+            if self.policy.refresh:
+                task = self.refresh_tasks.pop(method, None)
+                if task is not None:
+                    task.cancel()
+                self.refresh_tasks[method] = asyncio.create_task(self.refresh(method))
+
+    async def refresh(self, method: str) -> None:
+        await asyncio.sleep(self.policy.debounce)
+        del self.refresh_tasks[method]
+        try:
+            await self.get(method)
+        except Exception as e:
+            logger.warning(f"Refreshing {method} failed: {e}")
+
+    def clear(self) -> None:
+        for task in self.refresh_tasks.values():
+            task.cancel()
+        self.refresh_tasks.clear()
+        self.loading.clear()
+        self.entries.clear()
+        for method in self.generations:
+            self.generations[method] += 1
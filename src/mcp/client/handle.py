@@ -0,0 +1,71 @@
+from contextvars import ContextVar
+from src.mcp.types.common import RequestId
+from src.mcp.types.notification import ProgressNotificationParams
+from typing import Any, AsyncIterator, Generator, Generic, Optional, TypeVar
+import asyncio
+
+T = TypeVar("T")
+
+current_handle: ContextVar[Optional["RequestHandle"]] = ContextVar("current_handle", default=None)
+
+
+class RequestHandle(Generic[T]):
+    """
+    Handle to a Session request running in the background, created by `Session.spawn`.
+
+    Awaiting the handle returns the result. `cancel()` abandons the request:
+    the pending entry is removed, the server receives `notifications/cancelled`
+    for `request_id`, and a response arriving later is ignored.
+
+    For requests that report progress, `progress()` iterates over the updates
+    until the request finishes.
+    """
+
+    def __init__(self) -> None:
+        self.request_id: Optional[RequestId] = None
+        self.task: Optional[asyncio.Task[T]] = None
+        self._progress: asyncio.Queue[ProgressNotificationParams] = asyncio.Queue()
+
+    async def on_progress(self, params: ProgressNotificationParams) -> None:
+        self._progress.put_nowait(params)
+
+    async def progress(self) -> AsyncIterator[ProgressNotificationParams]:
+        '''
+        Iterate over progress updates of the request
+
+        Yields:
+            Progress notification params, in arrival order, until the request finishes
+        '''
+        while True:
+            update = asyncio.ensure_future(self._progress.get())
+            await asyncio.wait({update, self.task}, return_when=asyncio.FIRST_COMPLETED)
+            if not update.done():
+                update.cancel()
+                break
+            yield update.result()
+        while not self._progress.empty():
+            yield self._progress.get_nowait()
+
+    def cancel(self, reason: Optional[str] = None) -> bool:
+        '''
+        Cancel the request
+
+        Args:
+            reason: Reason sent to the server in the cancellation notice
+
+        Returns:
+            False if the request had already finished
+        '''
+        return self.task.cancel(msg=reason)
+
+    def done(self) -> bool:
+        return self.task.done()
+
+    def cancelled(self) -> bool:
+        return self.task.cancelled()
+
+    def result(self) -> T:
+        return self.task.result()
+
+    def __await__(self) -> Generator[Any, None, T]:
+        return self.task.__await__()
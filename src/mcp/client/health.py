@@ -0,0 +1,169 @@
+from src.mcp.client.session import Session
+from src.mcp.logger import get_logger
+from dataclasses import dataclass
+from typing import Any, Literal, Optional
+import asyncio
+import time
+
+logger = get_logger(__name__)
+
+HealthStatus = Literal["healthy", "degraded", "dead"]
+
+
+@dataclass
+class ServerHealth:
+    """
+    Liveness of one server, from the health checks of its session.
+
+    `rtt` and `error_rate` are exponentially weighted moving averages: each
+    check moves them by `alpha` towards the latest round-trip time (seconds)
+    and outcome (1 for a failed ping, 0 for a successful one).
+    """
+    status: HealthStatus = "healthy"
+    rtt: Optional[float] = None
+    error_rate: float = 0.0
+    consecutive_failures: int = 0
+    last_check: Optional[float] = None
+
+    def record(self, rtt: Optional[float], alpha: float) -> None:
+        '''
+        Fold the outcome of a check into the averages
+
+        Args:
+            rtt: Round-trip time of a successful ping, or None if it failed
+            alpha: Weight of the latest sample
+        '''
+        self.last_check = time.monotonic()
+        self.error_rate += alpha * ((rtt is None) - self.error_rate)
+        if rtt is None:
+            self.consecutive_failures += 1
+            return
+        self.consecutive_failures = 0
+        self.rtt = rtt if self.rtt is None else self.rtt + alpha * (rtt - self.rtt)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'status': self.status,
+            'rtt': self.rtt,
+            'error_rate': self.error_rate,
+        }
+
+
+class HealthMonitor:
+    """
+    Pings every session of an MCPClient from a single timer loop.
+
+    Every `interval` seconds all sessions are pinged concurrently, each ping
+    bounded by `timeout`. A server is dead after `dead_after` consecutive
+    failed pings, or once its session closed; degraded when its RTT average
+    exceeds `degraded_rtt` seconds or its error rate exceeds
+    `degraded_error_rate`; healthy otherwise. A dead session with a reconnect
+    policy is told its connection is lost, which starts a reconnect.
+    """
+
+    def __init__(
+        self,
+        sessions: dict[str, Session],
+        interval: float = 30,
+        timeout: float = 5,
+        alpha: float = 0.3,
+        degraded_rtt: float = 1.0,
+        degraded_error_rate: float = 0.2,
+        dead_after: int = 3,
+    ) -> None:
+        self.sessions = sessions
+        self.interval = interval
+        self.timeout = min(timeout, interval)
+        self.alpha = alpha
+        self.degraded_rtt = degraded_rtt
+        self.degraded_error_rate = degraded_error_rate
+        self.dead_after = dead_after
+        self.health: dict[str, ServerHealth] = {}
+        self.task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_config(cls, sessions: dict[str, Session], config: Optional[dict[str, Any]]) -> Optional['HealthMonitor']:
+        '''
+        Build a monitor from the `healthCheck` entry of the client configuration
+
+        Args:
+            sessions: The sessions to monitor, by server name
+            config: Monitor settings, e.g. {"interval": 30, "timeout": 5}, or None to disable
+
+        Returns:
+            The monitor, or None if health checking is disabled
+        '''
+        if not config:
+            return None
+        return cls(sessions, **config)
+
+    def start(self) -> None:
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.check_all()
+            except Exception as e:
+                logger.error(f"Health check failed: {e}", exc_info=True)
+
+    async def check_all(self) -> None:
+        """Ping every session once and update their health."""
+        sessions = dict(self.sessions)
+        for name in list(self.health):
+            if name not in sessions:
+                del self.health[name]
+        await asyncio.gather(*(self.check(name, session) for name, session in sessions.items()))
+
+    async def check(self, name: str, session: Session) -> ServerHealth:
+        '''
+        Ping a session and update its health
+
+        Args:
+            name: The server name
+            session: The session to ping
+
+        Returns:
+            The updated health of the server
+        '''
+        health = self.health.setdefault(name, ServerHealth())
+        start = time.perf_counter()
+        try:
+            # Bounds the wait for a reconnect in progress as well as the ping itself
+            async with asyncio.timeout(self.timeout):
+                await session.ping()
+            health.record(time.perf_counter() - start, self.alpha)
+        except Exception as e:
+            logger.debug(f"Health check of {name} failed: {e}")
+            health.record(None, self.alpha)
+
+        previous = health.status
+        health.status = self.classify(health, session)
+        if health.status != previous:
+            logger.info(f"Server {name} is {health.status}")
+            if health.status == "dead" and session.reconnect_policy is not None and not session.closed:
+                session.transport.connection_lost(f"{health.consecutive_failures} consecutive health checks failed")
+        return health
+
+    def classify(self, health: ServerHealth, session: Session) -> HealthStatus:
+        if session.closed or health.consecutive_failures >= self.dead_after:
+            return "dead"
+        if health.consecutive_failures or health.error_rate > self.degraded_error_rate:
+            return "degraded"
+        if health.rtt is not None and health.rtt > self.degraded_rtt:
+            return "degraded"
+        return "healthy"
+
+    def get(self, name: str) -> Optional[ServerHealth]:
+        return self.health.get(name)
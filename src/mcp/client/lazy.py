@@ -0,0 +1,40 @@
+from dataclasses import dataclass
+from typing import Any, Optional
+
+
+@dataclass
+class LazySessions:
+    """
+    Settings for sessions started on first use by `MCPClient.get_or_create_session`.
+
+    A session without requests in flight for `idle_ttl` seconds is shut down
+    (None keeps it alive). At most `max_sessions` sessions are live at once;
+    starting another one first shuts down the least recently used idle
+    session. Idle sessions are looked for every `sweep_interval` seconds,
+    by default a quarter of `idle_ttl`.
+    """
+    idle_ttl: Optional[float] = 300
+    max_sessions: Optional[int] = None
+    sweep_interval: Optional[float] = None
+
+    def get_sweep_interval(self) -> Optional[float]:
+        if self.sweep_interval is not None:
+            return self.sweep_interval
+        return self.idle_ttl / 4 if self.idle_ttl is not None else None
+
+    @classmethod
+    def from_config(cls, config: bool | dict[str, Any] | None) -> Optional['LazySessions']:
+        '''
+        Build the settings from the `lazySessions` entry of the client configuration
+
+        Args:
+            config: True for the defaults, a dict of settings, or None/False to disable
+
+        Returns:
+            The settings, or None if sessions are only started explicitly
+        '''
+        if not config:
+            return None
+        if config is True:
+            return cls()
+        return cls(**config)
@@ -0,0 +1,58 @@
+from src.mcp.types.common import PaginatedRequestParams
+from src.mcp.client.result import ResultMode, parse_result
+from pydantic import BaseModel
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+import asyncio
+
+PageFetcher = Callable[[PaginatedRequestParams], Awaitable[dict[str, Any]]]
+
+
+async def paginate(
+    fetch: PageFetcher,
+    items_field: str,
+    model: type[BaseModel],
+    result_mode: ResultMode = "model",
+    page_size: Optional[int] = None,
+    limit: Optional[int] = None,
+) -> AsyncIterator[Any]:
+    '''
+    Iterate over the items of a paginated list, following `nextCursor`
+
+    The request for the next page is sent as soon as a page arrives, so it
+    travels while the caller consumes the current one. Stopping early
+    (breaking out, reaching `limit`) cancels it.
+
+    Args:
+        fetch: Sends the list request with the given params and returns the raw result
+        items_field: The result field holding the items, e.g. "tools"
+        model: The item model
+        result_mode: How each item is returned, as for results
+        page_size: Number of items per page to ask for; a hint sent as `_meta.pageSize`, which servers may ignore
+        limit: Maximum number of items to yield
+
+    Yields:
+        The items of every page in order
+    '''
+    meta = {"pageSize": page_size} if page_size else None
+    next_page: Optional[asyncio.Task] = asyncio.create_task(fetch(PaginatedRequestParams(_meta=meta) if meta else None))
+    count = 0
+    try:
+        while next_page is not None and (limit is None or count < limit):
+            result = await next_page
+            cursor = result.get("nextCursor")
+            items = result.get(items_field) or []
+            next_page = None
+            if cursor and (limit is None or count + len(items) < limit):
+                next_page = asyncio.create_task(fetch(PaginatedRequestParams(cursor=cursor, _meta=meta)))
+            for item in items:
+                if limit is not None and count >= limit:
+                    break
+                count += 1
+                yield parse_result(model, item, result_mode)
+    finally:
+        if next_page is not None:
+            if next_page.done():
+                if not next_page.cancelled():
+                    next_page.exception()
+            else:
+                next_page.cancel()
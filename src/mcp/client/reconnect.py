@@ -0,0 +1,61 @@
+from src.mcp.types.json_rpc import Method
+from dataclasses import dataclass
+from typing import Any, Optional
+import random
+
+REPLAYABLE_METHODS = frozenset({
+    Method.PING,
+    Method.RESOURCES_LIST,
+    Method.RESOURCES_READ,
+    Method.RESOURCES_TEMPLATES_LIST,
+    Method.RESOURCES_SUBSCRIBE,
+    Method.RESOURCES_UNSUBSCRIBE,
+    Method.TOOLS_LIST,
+    Method.PROMPTS_LIST,
+    Method.PROMPTS_GET,
+    Method.TASKS_LIST,
+    Method.COMPLETION_COMPLETE,
+    Method.LOGGING_SET_LEVEL,
+})
+"""Methods without side effects beyond idempotent state, safe to send again after a reconnect."""
+
+
+@dataclass
+class ReconnectPolicy:
+    """
+    How a Session reconnects after losing its connection.
+
+    Attempt `n` (from 0) waits `initial_delay * multiplier ** n`, capped at
+    `max_delay`, with up to `jitter` of it randomly removed so that clients
+    restarted together do not reconnect in lockstep.
+
+    A replayable request is sent again at most `max_replays` times, so a
+    request that crashes the server every time does not loop forever.
+    """
+    max_attempts: int = 5
+    initial_delay: float = 0.5
+    max_delay: float = 30.0
+    multiplier: float = 2.0
+    jitter: float = 0.5
+    max_replays: int = 1
+
+    def delay(self, attempt: int) -> float:
+        delay = min(self.initial_delay * self.multiplier ** attempt, self.max_delay)
+        return delay * (1 - random.uniform(0, self.jitter))
+
+    @classmethod
+    def from_config(cls, config: bool | dict[str, Any] | None) -> Optional['ReconnectPolicy']:
+        '''
+        Build a policy from the `reconnect` entry of a server configuration
+
+        Args:
+            config: True for the default policy, a dict of policy fields, or None/False to disable
+
+        Returns:
+            The policy, or None if reconnecting is disabled
+        '''
+        if not config:
+            return None
+        if config is True:
+            return cls()
+        return cls(**config)
@@ -0,0 +1,176 @@
+from src.mcp.types.tools import Tool
+from dataclasses import dataclass
+from typing import Any, Literal, Optional
+import time
+
+NamespaceMode = Literal["collisions", "always"]
+
+
+@dataclass
+class RegisteredTool:
+    """
+    A tool of one server as exposed by the registry: `name` is what callers
+    use, `tool.name` what the server knows it as.
+    """
+    name: str
+    server: str
+    tool: Tool
+
+    def exposed(self) -> Tool:
+        return self.tool if self.name == self.tool.name else self.tool.model_copy(update={"name": self.name})
+
+
+class ToolRegistry:
+    """
+    The tools of every server merged under one namespace.
+
+    With `namespace="collisions"` a tool keeps its own name unless another
+    server has a tool of the same name; all of those are then exposed as
+    `<server><separator><tool>`. With `namespace="always"` every tool is.
+    The qualified form resolves in both modes, so callers can always be
+    explicit.
+
+    Servers are added, replaced and removed one at a time; only the tools
+    whose exposed name changes are touched. Servers that started or whose
+    catalog changed are marked stale until their tools are fetched again.
+    A failed fetch is retried after `retry_delay` seconds, doubling on each
+    further failure up to `max_retry_delay`.
+    """
+
+    def __init__(self, separator: str = "__", namespace: NamespaceMode = "collisions", retry_delay: float = 1.0, max_retry_delay: float = 60.0) -> None:
+        self.separator = separator
+        self.namespace = namespace
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.tools: dict[str, RegisteredTool] = {}
+        self.qualified: dict[str, RegisteredTool] = {}
+        self.servers: dict[str, dict[str, RegisteredTool]] = {}
+        self.owners: dict[str, set[str]] = {}
+        self.stale: set[str] = set()
+        self.generations: dict[str, int] = {}
+        self.failures: dict[str, int] = {}
+        self.retry_at: dict[str, float] = {}
+
+    @classmethod
+    def from_config(cls, config: Optional[dict[str, Any]]) -> 'ToolRegistry':
+        '''
+        Build a registry from the `toolRegistry` entry of the client configuration
+
+        Args:
+            config: Registry settings, e.g. {"separator": "__", "namespace": "always"}, or None for the defaults
+
+        Returns:
+            The registry
+        '''
+        return cls(**(config or {}))
+
+    def qualify(self, server: str, tool_name: str) -> str:
+        return f"{server}{self.separator}{tool_name}"
+
+    def exposed_name(self, server: str, tool_name: str) -> str:
+        if self.namespace == "always" or len(self.owners.get(tool_name, ())) > 1:
+            return self.qualify(server, tool_name)
+        return tool_name
+
+    def get(self, name: str) -> Optional[RegisteredTool]:
+        '''
+        Resolve a tool name
+
+        Args:
+            name: An exposed or qualified tool name
+
+        Returns:
+            The registered tool, or None if no server has it
+        '''
+        return self.tools.get(name) or self.qualified.get(name)
+
+    def list_tools(self) -> list[Tool]:
+        return [entry.exposed() for entry in self.tools.values()]
+
+    def update_server(self, server: str, tools: list[Tool]) -> None:
+        '''
+        Replace the tools of a server
+
+        Args:
+            server: The server name
+            tools: Its complete tool list
+        '''
+        previous = self.servers.get(server, {})
+        current = {tool.name: tool for tool in tools}
+        for tool_name in previous.keys() - current.keys():
+            self._remove(server, tool_name)
+        entries = self.servers.setdefault(server, {})
+        for tool_name, tool in current.items():
+            if tool_name in entries:
+                entries[tool_name].tool = tool
+            else:
+                self._add(server, tool)
+
+    def remove_server(self, server: str) -> None:
+        for tool_name in list(self.servers.get(server, {})):
+            self._remove(server, tool_name)
+        self.servers.pop(server, None)
+        self.stale.discard(server)
+        self.failures.pop(server, None)
+        self.retry_at.pop(server, None)
+
+    def mark_stale(self, server: str) -> None:
+        self.stale.add(server)
+        self.generations[server] = self.generations.get(server, 0) + 1
+        # News from the server is worth a fetch even while backing off
+        self.retry_at.pop(server, None)
+
+    def generation(self, server: str) -> int:
+        return self.generations.get(server, 0)
+
+    def is_due(self, server: str) -> bool:
+        return server in self.stale and time.monotonic() >= self.retry_at.get(server, 0.0)
+
+    def refreshed(self, server: str, tools: list[Tool], generation: int) -> None:
+        '''
+        Store the tools fetched from a server
+
+        Args:
+            server: The server name
+            tools: Its complete tool list
+            generation: The server's generation when the fetch started; it stays stale if it was marked since
+        '''
+        self.update_server(server, tools)
+        self.failures.pop(server, None)
+        self.retry_at.pop(server, None)
+        if self.generation(server) == generation:
+            self.stale.discard(server)
+
+    def refresh_failed(self, server: str) -> None:
+        failures = self.failures[server] = self.failures.get(server, 0) + 1
+        self.retry_at[server] = time.monotonic() + min(self.retry_delay * 2 ** (failures - 1), self.max_retry_delay)
+
+    def _add(self, server: str, tool: Tool) -> None:
+        owners = self.owners.setdefault(tool.name, set())
+        owners.add(server)
+        entry = RegisteredTool(self.exposed_name(server, tool.name), server, tool)
+        self.servers.setdefault(server, {})[tool.name] = entry
+        self.qualified[self.qualify(server, tool.name)] = entry
+        self.tools[entry.name] = entry
+        if len(owners) == 2:
+            # The tool of the first owner was exposed unqualified until now
+            self._rename(next(iter(owners - {server})), tool.name)
+
+    def _remove(self, server: str, tool_name: str) -> None:
+        entry = self.servers[server].pop(tool_name)
+        del self.tools[entry.name]
+        del self.qualified[self.qualify(server, tool_name)]
+        owners = self.owners[tool_name]
+        owners.discard(server)
+        if not owners:
+            del self.owners[tool_name]
+        elif len(owners) == 1:
+            self._rename(next(iter(owners)), tool_name)
+
+    def _rename(self, server: str, tool_name: str) -> None:
+        entry = self.servers[server][tool_name]
+        name = self.exposed_name(server, tool_name)
+        if name != entry.name:
+            del self.tools[entry.name]
+            entry.name = name
+            self.tools[name] = entry
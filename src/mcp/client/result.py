@@ -0,0 +1,97 @@
+from pydantic import BaseModel, TypeAdapter
+from typing import Any, Generic, Literal, TypeVar
+from functools import lru_cache
+
+ResultMode = Literal["model", "lazy", "raw"]
+"""
+How `Session` returns results:
+    model: fully validated pydantic model (default)
+    lazy: `LazyResult` view that validates a field on first access
+    raw: the decoded JSON dict, without any validation
+"""
+
+T = TypeVar("T", bound=BaseModel)
+
+@lru_cache(maxsize=None)
+def _field_adapter(model: type[BaseModel], name: str) -> TypeAdapter:
+    return TypeAdapter(model.model_fields[name].annotation)
+
+@lru_cache(maxsize=None)
+def _field_aliases(model: type[BaseModel]) -> dict[str, str]:
+    return {name: field.alias or name for name, field in model.model_fields.items()}
+
+
+class LazyResult(Generic[T]):
+    """
+    Read-only view over a raw result that validates fields against `model` on access.
+
+    Only the accessed field is validated, and the validated value is cached.
+    Unknown keys are returned as-is. `raw` is the untouched JSON dict, and
+    `validate()` builds the full model when the whole result is needed.
+    """
+    __slots__ = ("_model", "_raw", "_cache")
+
+    def __init__(self, model: type[T], raw: dict[str, Any]) -> None:
+        self._model = model
+        self._raw = raw
+        self._cache: dict[str, Any] = {}
+
+    @property
+    def raw(self) -> dict[str, Any]:
+        return self._raw
+
+    def validate(self) -> T:
+        return self._model.model_validate(self._raw)
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("__"):
+            raise AttributeError(name)
+        if name in self._cache:
+            return self._cache[name]
+        aliases = _field_aliases(self._model)
+        if name in aliases:
+            key = aliases[name]
+            if key in self._raw:
+                value = _field_adapter(self._model, name).validate_python(self._raw[key])
+            elif self._model.model_fields[name].is_required():
+                raise AttributeError(f"{self._model.__name__} result has no '{key}' field")
+            else:
+                value = self._model.model_fields[name].get_default(call_default_factory=True)
+        elif name in self._raw:
+            value = self._raw[name]
+        else:
+            raise AttributeError(f"{self._model.__name__} result has no attribute '{name}'")
+        self._cache[name] = value
+        return value
+
+    def __getitem__(self, key: str) -> Any:
+        return self._raw[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._raw
+
+    def __repr__(self) -> str:
+        return f"LazyResult[{self._model.__name__}]({self._raw!r})"
+
+
+def parse_result(model: type[T], result: Any, mode: ResultMode = "model") -> T | LazyResult[T] | dict[str, Any]:
+    '''
+    Convert a raw JSON-RPC result according to the result mode
+
+    Args:
+        model: The result model to validate against
+        result: The decoded `result` member of the response
+        mode: The result mode
+
+    Returns:
+        The validated model, a lazy view or the raw dict
+    '''
+    match mode:
+        case "model":
+            return model.model_validate(result)
+        case "lazy":
+            return LazyResult(model, result)
+        case "raw":
+            return result
+        case _:
+            raise ValueError(f"Unknown result mode: {mode}")
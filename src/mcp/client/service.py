@@ -1,12 +1,28 @@
-from src.mcp.client.utils import create_transport_from_server_config
+from src.mcp.client.utils import create_transport_from_server_config, get_endpoint_configs, is_http_transport, is_sse_transport
+from src.mcp.transport.pool import HTTPClientPool, PoolLimits
+from src.mcp.transport.balanced import BalancedTransport
 from src.mcp.types.elicitation import ElicitationFn
 from src.mcp.types.sampling import SamplingFn
 from src.mcp.types.roots import ListRootsFn
 from src.mcp.client.session import Session
+from src.mcp.client.reconnect import ReconnectPolicy
+from src.mcp.client.catalog import CatalogPolicy
+from src.mcp.client.snapshot import CatalogSnapshot, SnapshotStore
+from src.mcp.client.registry import ToolRegistry
+from src.mcp.client.health import HealthMonitor, ServerHealth
+from src.mcp.client.startup import ServerStartup, StartupReport
+from src.mcp.client.lazy import LazySessions
+from src.mcp.logger import get_logger
 from src.mcp.types.info import Implementation
+from src.mcp.types.tools import CallToolRequestParams, CallToolResult, Tool
+from src.mcp.types.json_rpc import Method
 from typing import Callable, Optional
 from typing import Any
+import asyncio
 import json
+import time
+
+logger = get_logger(__name__)
 
 class MCPClient:
     client_info = Implementation(name="MCP Client", version="0.1.0")
@@ -18,6 +34,19 @@ class MCPClient:
         self.elicitation_callback = elicitation_callback
         self.logging_callback = logging_callback
         self.sessions: dict[str, Session] = {}
+        self.http_pool = HTTPClientPool()
+        self.health_config = config.get("healthCheck")
+        self.health_monitor = HealthMonitor.from_config(self.sessions, self.health_config)
+        self.lazy_config = config.get("lazySessions")
+        self.lazy_sessions = LazySessions.from_config(self.lazy_config)
+        self.starting: dict[str, asyncio.Task[Session]] = {}
+        self.sweep_task: Optional[asyncio.Task] = None
+        self.snapshot_config = config.get("catalogSnapshots")
+        self.snapshots = SnapshotStore.from_config(self.snapshot_config)
+        self.snapshot_tasks: set[asyncio.Task] = set()
+        self.registry_config = config.get("toolRegistry")
+        self.tool_registry = ToolRegistry.from_config(self.registry_config)
+        self.tool_refreshes: dict[str, asyncio.Task] = {}
         
     @classmethod
     def from_config(cls, config: dict[str, dict[str, Any]], sampling_callback: Optional[Callable] = None, elicitation_callback: Optional[Callable] = None, list_roots_callback: Optional[Callable] = None, logging_callback: Optional[Callable] = None) -> 'MCPClient':
@@ -32,19 +61,61 @@ class MCPClient:
     def get_server_names(self) -> list[str]:
         return list(self.servers.keys())
     
-    def get_servers_metadata(self) -> list[dict[str, bool]]:
-        return [{
-            'name': name,
-            'description': config.get("description", ""),
-            'status': self.is_connected(name)
-        } for name, config in self.servers.items()]
+    def get_servers_metadata(self) -> list[dict[str, Any]]:
+        '''
+        Describe every configured server with its liveness
+
+        Returns:
+            One dict per server; "status" is "disconnected" without a session, otherwise the
+            health status ("healthy", "degraded" or "dead"), with "rtt" (seconds) and "error_rate"
+            averages once health checks ran, and "endpoints" for servers with several URLs
+        '''
+        metadata = []
+        for name, config in self.servers.items():
+            health = self.get_health(name)
+            entry = {
+                'name': name,
+                'description': config.get("description", ""),
+                'connected': self.is_connected(name),
+                **(health.to_dict() if health else {'status': 'disconnected', 'rtt': None, 'error_rate': None}),
+            }
+            transport = self.sessions[name].transport if self.is_connected(name) else None
+            if isinstance(transport, BalancedTransport):
+                entry['endpoints'] = [stats.to_dict() for stats in transport.stats]
+            metadata.append(entry)
+        return metadata
+
+    def get_health(self, name: str) -> ServerHealth | None:
+        '''
+        Health of a connected server
+
+        Args:
+            name: The server name
+
+        Returns:
+            The health from the last checks, a default healthy entry if none ran yet, or None without a session
+        '''
+        if not self.is_connected(name):
+            return None
+        if self.health_monitor is not None and (health := self.health_monitor.get(name)):
+            return health
+        return ServerHealth()
 
     def to_config_file(self, config_file_path: str) -> None:
         with open(config_file_path, "w") as f:
             json.dump(self.to_config(), f, indent=4)
 
     def to_config(self) -> dict[str, dict[str, Any]]:
-        return {"mcpServers": self.servers}
+        config = {"mcpServers": self.servers}
+        if self.health_config:
+            config["healthCheck"] = self.health_config
+        if self.lazy_config:
+            config["lazySessions"] = self.lazy_config
+        if self.snapshot_config:
+            config["catalogSnapshots"] = self.snapshot_config
+        if self.registry_config:
+            config["toolRegistry"] = self.registry_config
+        return config
 
     def add_server(self, name: str, config: dict[str, Any], auto_connect: bool = False) -> None:
         self.servers[name] = config
@@ -56,25 +127,262 @@ class MCPClient:
             self.close_session(name)
         del self.servers[name]
 
-    async def create_session(self, name: str) -> Session:
+    async def create_session(self, name: str, startup: Optional[ServerStartup] = None, startup_timeout: Optional[float] = None, startup_limit: Optional[asyncio.Semaphore] = None) -> Session:
         if not self.servers:
             raise Exception("No MCP servers available")
         if name not in self.servers:
             raise ValueError(f"{name} not found")
         server_config = self.servers.get(name)
-        transport = create_transport_from_server_config(server_config=server_config)
+        transport = create_transport_from_server_config(server_config=server_config, http_pool=self.http_pool)
         transport.attach_callbacks({
             'sampling': self.sampling_callback,
             'elicitation': self.elicitation_callback,
             'list_roots': self.list_roots_callback,
             'logging': self.logging_callback
         })
-        session = Session(transport=transport, client_info=self.client_info)
-        await session.connect()
-        await session.initialize()
+        session = Session(
+            transport=transport,
+            client_info=self.client_info,
+            result_mode=server_config.get("result_mode", "model"),
+            reconnect=ReconnectPolicy.from_config(server_config.get("reconnect")),
+            catalog=CatalogPolicy.from_config(server_config.get("catalog_cache")),
+        )
+        session.on_close = lambda: self.discard_session(name, session)
+        session.on_list_changed = lambda method: self.list_changed(name, method)
+        # A restarted server may have changed its tools while it was down
+        self.tool_registry.mark_stale(name)
+        snapshot = await self.snapshots.load(server_config) if self.snapshots is not None else None
+        if snapshot is not None:
+            # Serve the catalogs at once; the server starts behind the session and is checked against them
+            session.restore(snapshot)
+            timeout = startup_timeout if startup_timeout is not None else server_config.get("startup_timeout")
+            startup_task = session.start_in_background(timeout, startup_limit)
+            self.run_snapshot_task(self.update_snapshot(server_config, session, snapshot, startup_task))
+            if startup is not None:
+                startup.follow(startup_task)
+            self.sessions[name] = session
+            if self.health_monitor is not None:
+                self.health_monitor.start()
+            return session
+        try:
+            start = time.perf_counter()
+            await session.connect()
+            connected = time.perf_counter()
+            await session.initialize()
+            if startup is not None:
+                startup.connect_time = connected - start
+                startup.initialize_time = time.perf_counter() - connected
+        except BaseException:
+            # Do not leave a half-started server behind, also when startup is cancelled
+            session.on_close = None
+            await session.shutdown()
+            raise
         self.sessions[name] = session
+        if self.snapshots is not None:
+            self.run_snapshot_task(self.update_snapshot(server_config, session))
+        if self.health_monitor is not None:
+            self.health_monitor.start()
         return session
+
+    def run_snapshot_task(self, coro) -> None:
+        task = asyncio.create_task(coro)
+        self.snapshot_tasks.add(task)
+        task.add_done_callback(self.snapshot_tasks.discard)
+
+    async def update_snapshot(self, server_config: dict[str, Any], session: Session, snapshot: Optional[CatalogSnapshot] = None, startup_task: Optional[asyncio.Task] = None) -> None:
+        '''
+        Save the catalogs of a live server, or check a restored snapshot against them
+
+        Args:
+            server_config: The server's configuration entry, keying the snapshot
+            session: The session of the server
+            snapshot: The snapshot the session was restored from, if any
+            startup_task: The background startup of a restored session, awaited first
+        '''
+        try:
+            if startup_task is not None:
+                await startup_task
+            generations = dict(session.catalog.generations) if session.catalog is not None else {}
+            live = CatalogSnapshot(session.dump_initialize_result(), await session.fetch_catalogs())
+        except Exception as e:
+            logger.warning(f"Could not refresh the catalog snapshot: {e}")
+            return
+        if snapshot is not None and snapshot.initialize == live.initialize and snapshot.catalogs == live.catalogs:
+            return
+        if snapshot is not None:
+            logger.info(f"Catalog snapshot of {live.initialize.get('serverInfo', {}).get('name')} is stale, replacing it")
+            if session.catalog is not None:
+                for method, result in live.catalogs.items():
+                    session.catalog.seed(method, result, generations.get(method))
+        await self.snapshots.save(server_config, live)
+
+    def discard_session(self, name: str, session: Session) -> None:
+        '''
+        Forget a session whose connection was lost for good
+
+        Args:
+            name: The server name
+            session: The session that closed, only removed if it is still the registered one
+        '''
+        if self.sessions.get(name) is session:
+            del self.sessions[name]
+            self.forget_tools(name)
+
+    def forget_tools(self, name: str) -> None:
+        # Servers started on demand keep their tools, so calling one starts the server again
+        if self.lazy_sessions is None:
+            self.tool_registry.remove_server(name)
+
+    def list_changed(self, name: str, method: str) -> None:
+        if method == Method.NOTIFICATION_TOOLS_LIST_CHANGED:
+            self.tool_registry.mark_stale(name)
+
+    async def refresh_tool_registry(self, names: Optional[list[str]] = None) -> None:
+        '''
+        Fetch the tools of live servers that started or whose tools changed since their last refresh
+
+        Args:
+            names: Only consider these servers, or None for every stale one
+        '''
+        registry = self.tool_registry
+        # Servers that are not running are marked again when they start; servers whose
+        # last fetch failed wait out their backoff
+        due = [name for name in (registry.stale if names is None else names) if name in self.sessions and registry.is_due(name)]
+        # One caller giving up must not cancel a refresh the others wait for
+        await asyncio.gather(*(asyncio.shield(self.refresh_tools(name)) for name in due))
+
+    def refresh_tools(self, name: str) -> asyncio.Task:
+        '''
+        Fetch the tools of a live server, sharing a fetch already in flight
+
+        Args:
+            name: The server name
+
+        Returns:
+            The refresh task; it does not raise, a failure is logged and retried later
+        '''
+        task = self.tool_refreshes.get(name)
+        if task is None:
+            task = self.tool_refreshes[name] = asyncio.create_task(self._refresh_tools(name))
+            task.add_done_callback(lambda _: self.tool_refreshes.pop(name, None))
+        return task
+
+    async def _refresh_tools(self, name: str) -> None:
+        registry = self.tool_registry
+        session = self.sessions[name]
+        # A change notified during the fetch keeps the server stale
+        generation = registry.generation(name)
+        try:
+            tools = [tool async for tool in session.iter_tools(result_mode="model")]
+        except Exception as e:
+            logger.warning(f"Failed to list the tools of {name}: {e}")
+            registry.refresh_failed(name)
+            return
+        if self.sessions.get(name) is session:
+            registry.refreshed(name, tools, generation)
+
+    async def get_tools(self) -> list[Tool]:
+        '''
+        The tools of all live servers under their registry names
+
+        Returns:
+            One tool per registry entry; colliding names are prefixed with the server name
+        '''
+        await self.refresh_tool_registry()
+        return self.tool_registry.list_tools()
+
+    async def call_tool(self, name: str, arguments: Optional[dict[str, Any]] = None, **kwargs: Any) -> CallToolResult:
+        '''
+        Call a tool by its registry name, on whichever server provides it
+
+        Args:
+            name: The tool's registry name, or its qualified `<server><separator><tool>` form
+            arguments: The tool arguments
+            **kwargs: Passed on to `Session.tools_call`, e.g. timeout or progress_callback
+
+        Returns:
+            The tool result
+        '''
+        registry = self.tool_registry
+        entry = registry.get(name)
+        if entry is None:
+            # The tool may belong to a server that started or changed since the last refresh
+            await self.refresh_tool_registry()
+            entry = registry.get(name)
+        elif entry.server in registry.stale:
+            # Its server may have renamed or dropped the tool; the other servers can wait
+            await self.refresh_tool_registry([entry.server])
+            entry = registry.get(name)
+        if entry is None:
+            raise ValueError(f"Tool {name} not found")
+        session = self.sessions.get(entry.server)
+        if session is None:
+            if self.lazy_sessions is None:
+                raise ValueError(f"Server {entry.server} of tool {name} is not connected")
+            session = await self.get_or_create_session(entry.server)
+        return await session.tools_call(CallToolRequestParams(name=entry.tool.name, arguments=arguments), **kwargs)
     
+    async def get_or_create_session(self, name: str) -> Session:
+        '''
+        Get the session of a server, starting it on first use
+
+        Concurrent calls for a server that is not running share a single startup.
+        With `lazySessions` configured, idle sessions are shut down after their
+        TTL and the least recently used idle one makes room beyond the session cap.
+
+        Args:
+            name: The server name
+
+        Returns:
+            The live session
+        '''
+        if session := self.sessions.get(name):
+            return session
+        if name not in self.starting:
+            self.starting[name] = asyncio.create_task(self._start_on_demand(name))
+        # A cancelled caller must not cancel the startup shared with other callers
+        return await asyncio.shield(self.starting[name])
+
+    async def _start_on_demand(self, name: str) -> Session:
+        try:
+            await self.make_room()
+            session = await self.create_session(name)
+            if self.lazy_sessions is not None and self.lazy_sessions.get_sweep_interval() and self.sweep_task is None:
+                self.sweep_task = asyncio.create_task(self.sweep_idle_sessions())
+            return session
+        finally:
+            del self.starting[name]
+
+    async def make_room(self) -> None:
+        '''
+        Shut down least recently used idle sessions until a new session fits under the session cap
+        '''
+        if self.lazy_sessions is None or self.lazy_sessions.max_sessions is None:
+            return
+        while len(self.sessions) + len(self.starting) > self.lazy_sessions.max_sessions:
+            idle = [(session.last_used, name) for name, session in self.sessions.items() if not session.transport.pending]
+            if not idle:
+                logger.warning(f"All {len(self.sessions)} sessions are busy, exceeding max_sessions={self.lazy_sessions.max_sessions}")
+                return
+            _, name = min(idle)
+            logger.info(f"Closing least recently used session {name}")
+            await self.close_session(name)
+
+    async def sweep_idle_sessions(self) -> None:
+        '''
+        Periodically shut down sessions idle for longer than the TTL
+        '''
+        interval = self.lazy_sessions.get_sweep_interval()
+        while True:
+            await asyncio.sleep(interval)
+            for name, session in list(self.sessions.items()):
+                if session.idle_time() > self.lazy_sessions.idle_ttl and self.sessions.get(name) is session:
+                    logger.info(f"Closing session {name} after {session.idle_time():.0f}s idle")
+                    try:
+                        await self.close_session(name)
+                    except Exception as e:
+                        logger.warning(f"Error closing idle session {name}: {e}")
+
     def is_connected(self, server_name: str) -> bool:
         return server_name in self.sessions
     
@@ -87,17 +395,76 @@ class MCPClient:
     async def close_session(self, name: str) -> None:
         if not self.is_connected(name):
             raise ValueError(f"Session {name} not found")
-        session = self.sessions.get(name)
+        # Unregister first so callers do not pick up a session being shut down
+        session = self.sessions.pop(name)
+        self.forget_tools(name)
         await session.shutdown()
-        del self.sessions[name]
 
-    async def create_all_sessions(self) -> None:
-        for name in self.servers:
-            await self.create_session(name=name)
+    async def preconnect(self) -> None:
+        '''
+        Open one connection per HTTP host so the first request of each session skips the handshake
+
+        SSE servers are skipped: their URL answers with an event stream, which
+        would hold the warmed connection, and their session opens the stream at once anyway.
+        '''
+        targets = {}
+        for config in self.servers.values():
+            for endpoint in get_endpoint_configs(config):
+                if is_http_transport(endpoint) and not is_sse_transport(endpoint):
+                    limits = PoolLimits.from_config(endpoint)
+                    targets.setdefault(self.http_pool.get_key(endpoint['url'], limits), (endpoint['url'], limits))
+        await asyncio.gather(*(self.http_pool.preconnect(url, limits) for url, limits in targets.values()))
+
+    async def create_all_sessions(self, max_concurrency: int = 8, startup_timeout: float = 60) -> StartupReport:
+        '''
+        Start every configured server concurrently
+
+        A server that fails or exceeds its timeout is reported and does not
+        stop the others. Servers can override the timeout with `startup_timeout`.
+        Servers restored from a catalog snapshot are usable at once and keep
+        starting in the background; their report entries are pending until
+        then, and `StartupReport.wait()` waits for them.
+
+        Args:
+            max_concurrency: Maximum number of servers starting at the same time
+            startup_timeout: Seconds allowed for connecting and initializing one server
+
+        Returns:
+            The startup report with per-server durations and errors
+        '''
+        report = StartupReport()
+        semaphore = asyncio.Semaphore(max_concurrency)
+        start = time.perf_counter()
+
+        async def start_server(name: str) -> None:
+            startup = report.servers[name] = ServerStartup(name=name)
+            timeout = self.servers[name].get("startup_timeout", startup_timeout)
+            async with semaphore:
+                try:
+                    async with asyncio.timeout(timeout):
+                        # A server restored from a snapshot starts in the background, within the same timeout and limit
+                        await self.create_session(name=name, startup=startup, startup_timeout=timeout, startup_limit=semaphore)
+                except TimeoutError:
+                    startup.error = f"Startup timed out after {timeout}s"
+                except Exception as e:
+                    startup.error = str(e) or type(e).__name__
+
+        await self.preconnect()
+        await asyncio.gather(*(start_server(name) for name in self.servers if not self.is_connected(name)))
+        report.elapsed = time.perf_counter() - start
+        return report
 
     async def close_all_sessions(self) -> None:
+        if self.health_monitor is not None:
+            await self.health_monitor.stop()
+        if self.sweep_task is not None:
+            self.sweep_task.cancel()
+            self.sweep_task = None
+        for task in [*self.snapshot_tasks, *self.tool_refreshes.values()]:
+            task.cancel()
         for name in list(self.sessions.keys()):
             await self.close_session(name=name)
+        await self.http_pool.aclose()
     
 
         
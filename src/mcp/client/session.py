@@ -1,6 +1,7 @@
 from src.mcp.types.capabilities import ClientCapabilities, ClientRootsCapability, ClientSamplingCapability, ClientElicitationCapability
-from src.mcp.types.json_rpc import JSONRPCRequest, JSONRPCNotification, Method, JSONRPCMessage, JSONRPCResponse
+from src.mcp.types.json_rpc import JSONRPCRequest, JSONRPCNotification, Method, JSONRPCMessage, JSONRPCResponse, JSONRPCResultResponse
 from src.mcp.types.resources import (
+    Resource, ResourceTemplate,
     ListResourcesRequest, ListResourcesResult,
     ReadResourceRequest, ReadResourceRequestParams, ReadResourceResult,
     ListResourceTemplatesRequest, ListResourceTemplatesResult,
@@ -16,24 +17,93 @@ from src.mcp.types.prompts import (
     Prompt, GetPromptResult, GetPromptRequest, GetPromptRequestParams,
     ListPromptsRequest, ListPromptsResult
 )
+from src.mcp.types.tasks import Task, ListTasksRequest, ListTasksResult
 from src.mcp.types.completion import CompleteRequest, CompleteRequestParams, CompleteResult
 from src.mcp.types.elicitation import ElicitResult
-from src.mcp.transport.base import BaseTransport
+from src.mcp.transport.base import BaseTransport, current_batch
+from src.mcp.client.result import ResultMode, parse_result
+from src.mcp.client.handle import RequestHandle, current_handle
+from src.mcp.client.batch import RequestBatch
+from src.mcp.client.pagination import paginate
+from src.mcp.client.reconnect import ReconnectPolicy, REPLAYABLE_METHODS
+from src.mcp.client.catalog import CatalogCache, CatalogPolicy, CATALOG_ITEMS, CATALOG_METHODS
+from src.mcp.client.snapshot import CatalogSnapshot
 from src.mcp.types.sampling import CreateMessageResult
 from src.mcp.types.info import Implementation
 from src.mcp.types.common import RequestParams, PaginatedRequestParams
 from src.mcp.types.logging import SetLevelRequest, SetLevelRequestParams
 from src.mcp.types.ping import PingRequest
-from src.mcp.types.notification import InitializedNotification
+from src.mcp.types.notification import InitializedNotification, ProgressFn, ProgressNotificationParams
 from src.mcp.types.roots import RootsListChangedNotification
-from typing import Optional, Any
-from uuid import uuid4
+from src.mcp.exception import MCPError, ConnectionLost
+from src.mcp.logger import get_logger
+from pydantic import BaseModel
+from typing import Optional, Any, AsyncIterator, Awaitable, Callable, TypeVar
+import asyncio
+import contextlib
+import time
+
+T = TypeVar("T")
+
+logger = get_logger(__name__)
 
 class Session:
-    def __init__(self, transport: BaseTransport, client_info: Implementation) -> None:
+    """
+    Client session with a single MCP server.
+
+    `result_mode` selects how results are returned: validated models ("model"),
+    `LazyResult` views that validate a field on access ("lazy"), or the decoded
+    JSON dicts ("raw"). It can be overridden per call.
+
+    Every request method accepts `timeout` (seconds) and `deadline` (absolute
+    `time.monotonic()` value); without them the transport's configured
+    per-method or default timeout applies.
+
+    `spawn` runs a request in the background and returns a `RequestHandle`
+    whose `cancel()` also cancels the request on the server.
+
+    `tools_call`, `resources_read` and `prompts_get` always send a progress
+    token; updates go to `progress_callback` and to the handle's `progress()`
+    iterator, and can keep the call alive with `reset_timeout_on_progress`.
+
+    `batch` collects several requests and sends them in a single write.
+
+    When the connection is lost, a session with a `reconnect` policy
+    reconnects with backoff and runs `initialize` again. Requests interrupted
+    by the loss are sent again only if that is safe: read-only methods, and
+    tools annotated `readOnlyHint` or `idempotentHint` in the last `tools_list`.
+    Other requests, and every request of a session without a policy or whose
+    reconnect failed, raise `ConnectionLost`; `on_close` is then called once.
+
+    With a `catalog` policy, the first page of `tools_list`, `prompts_list`,
+    `resources_list` and `resources_templates_list` is cached for servers
+    that send list_changed notifications, and refreshed when they do.
+
+    `restore` starts a session from a `CatalogSnapshot`: its initialize
+    result and catalogs are served at once while `start_in_background`
+    connects; requests that need the server wait for it.
+
+    `iter_tools`, `iter_prompts`, `iter_resources`, `iter_resource_templates`
+    and `iter_tasks` iterate over every item of a list, following cursors and
+    fetching the next page while the current one is consumed.
+    """
+    def __init__(self, transport: BaseTransport, client_info: Implementation, result_mode: ResultMode = "model", reconnect: Optional[ReconnectPolicy] = None, catalog: Optional[CatalogPolicy] = None) -> None:
         self.transport = transport
         self.client_info = client_info
+        self.result_mode = result_mode
+        self.reconnect_policy = reconnect
         self.initialize_result: Optional[InitializeResult] = None
+        self.replayable_tools: set[str] = set()
+        self.reconnect_task: Optional[asyncio.Task] = None
+        self.close_reason: Optional[str] = None
+        self.on_close: Optional[Callable[[], None]] = None
+        self.last_used = time.monotonic()
+        self.catalog = CatalogCache(catalog, self._fetch_list) if catalog is not None else None
+        self.restored: Optional[CatalogSnapshot] = None
+        self.on_list_changed: Optional[Callable[[str], None]] = None
+        self.startup_task: Optional[asyncio.Task] = None
+        self.transport.on_connection_lost = self._on_connection_lost
+        self.transport.on_list_changed = self._on_list_changed
 
     async def connect(self) -> None:
         await self.transport.connect()
@@ -41,6 +111,302 @@ class Session:
     def get_initialize_result(self) -> InitializeResult:
         return self.initialize_result
 
+    def get_stderr(self) -> list[str]:
+        """Recent stderr output of the server (stdio servers only)."""
+        return self.transport.get_stderr()
+
+    def spawn(self, method: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> RequestHandle[T]:
+        '''
+        Run a request method of this session in the background
+
+        Args:
+            method: A bound request method, e.g. `session.tools_call`
+            *args: Positional arguments for the method
+            **kwargs: Keyword arguments for the method
+
+        Returns:
+            A handle that can be awaited for the result or cancelled
+        '''
+        handle = RequestHandle()
+        token = current_handle.set(handle)
+        try:
+            handle.task = asyncio.create_task(method(*args, **kwargs))
+        finally:
+            current_handle.reset(token)
+        return handle
+
+    def idle_time(self) -> float:
+        """Seconds since the last request, or 0 while requests are in flight."""
+        if self.transport.pending:
+            return 0.0
+        return time.monotonic() - self.last_used
+
+    @property
+    def closed(self) -> bool:
+        """True once the connection is lost for good."""
+        return self.close_reason is not None
+
+    def _on_connection_lost(self, reason: str) -> None:
+        if self.closed or (self.reconnect_task is not None and not self.reconnect_task.done()):
+            return
+        if self.reconnect_policy is None or self.initialize_result is None:
+            self._close(reason)
+            return
+        self.reconnect_task = asyncio.create_task(self.reconnect(reason))
+
+    def _close(self, reason: str) -> None:
+        self.close_reason = reason
+        # Release the dead connection (reap the process, return the HTTP client)
+        self.reconnect_task = asyncio.create_task(self.transport.disconnect())
+        if self.on_close is not None:
+            self.on_close()
+
+    async def reconnect(self, reason: str) -> None:
+        '''
+        Reconnect the transport and initialize again, following the reconnect policy
+
+        Args:
+            reason: Why the connection was lost, reported if reconnecting fails
+        '''
+        policy = self.reconnect_policy
+        for attempt in range(policy.max_attempts):
+            await asyncio.sleep(policy.delay(attempt))
+            try:
+                await self.transport.disconnect()
+                await self.transport.connect()
+                await self.initialize()
+            except Exception as e:
+                logger.warning(f"Reconnect attempt {attempt + 1}/{policy.max_attempts} failed: {e}")
+                continue
+            logger.info(f"Reconnected after {attempt + 1} attempt(s)")
+            # The server may have changed its tools while the connection was down
+            if self.on_list_changed is not None:
+                self.on_list_changed(Method.NOTIFICATION_TOOLS_LIST_CHANGED)
+            return
+        self._close(f"{reason} (reconnect failed after {policy.max_attempts} attempts)")
+
+    def restore(self, snapshot: CatalogSnapshot) -> None:
+        '''
+        Serve the initialize result and catalogs of a snapshot until the server is live
+
+        Args:
+            snapshot: The snapshot of a previous start of the same server
+        '''
+        self.restored = snapshot
+        self.initialize_result = InitializeResult.model_validate(snapshot.initialize)
+        if Method.TOOLS_LIST in snapshot.catalogs:
+            self._remember_tools(snapshot.catalogs[Method.TOOLS_LIST])
+        if self.catalog is not None:
+            self.catalog.configure(self.initialize_result.capabilities)
+            # Lists without list_changed notifications are served until the live initialize only
+            self.catalog.cacheable.update(snapshot.catalogs)
+            for method, result in snapshot.catalogs.items():
+                self.catalog.seed(method, result)
+
+    def start_in_background(self, timeout: Optional[float] = None, limit: Optional[asyncio.Semaphore] = None) -> asyncio.Task:
+        '''
+        Connect and initialize without waiting; requests wait until it is done
+
+        Args:
+            timeout: Seconds allowed for connecting and initializing, or None for no limit
+            limit: Held while starting, to bound how many servers start at once
+
+        Returns:
+            The startup task, resulting in the connect and initialize durations in seconds; if it fails the session is closed
+        '''
+        self.startup_task = asyncio.create_task(self._start(timeout, limit))
+        return self.startup_task
+
+    async def _start(self, timeout: Optional[float], limit: Optional[asyncio.Semaphore]) -> tuple[float, float]:
+        try:
+            async with limit or contextlib.nullcontext():
+                async with asyncio.timeout(timeout):
+                    start = time.perf_counter()
+                    await self.connect()
+                    connected = time.perf_counter()
+                    await self.initialize()
+                    return connected - start, time.perf_counter() - connected
+        except TimeoutError as e:
+            self._close(f"Startup timed out after {timeout}s")
+            raise TimeoutError(f"Startup timed out after {timeout}s") from e
+        except Exception as e:
+            self._close(f"Startup failed: {e}")
+            raise
+
+    async def fetch_catalogs(self) -> dict[str, dict[str, Any]]:
+        '''
+        Fetch every list the server supports, following all pages
+
+        Returns:
+            The merged result of each list method, by method
+        '''
+        capabilities = self.initialize_result.capabilities
+        catalogs = {}
+        for method, capability in CATALOG_METHODS.items():
+            if getattr(capabilities, capability, None) is None:
+                continue
+            result = await self._fetch_list(method)
+            items = list(result.get(CATALOG_ITEMS[method]) or [])
+            while cursor := result.get("nextCursor"):
+                result = await self._fetch_list(method, cursor)
+                items.extend(result.get(CATALOG_ITEMS[method]) or [])
+            catalogs[method] = {CATALOG_ITEMS[method]: items}
+        return catalogs
+
+    async def _wait_connected(self) -> None:
+        if self.startup_task is not None and not self.startup_task.done():
+            try:
+                await asyncio.shield(self.startup_task)
+            except Exception:
+                pass
+        if self.reconnect_task is not None and not self.reconnect_task.done() and not self.closed:
+            await asyncio.shield(self.reconnect_task)
+        if self.closed:
+            raise ConnectionLost(self.close_reason)
+
+    def is_replayable(self, request: JSONRPCRequest) -> bool:
+        '''
+        Whether a request can be sent again after a reconnect without repeating side effects
+
+        Args:
+            request: The interrupted request
+
+        Returns:
+            True for read-only methods and tools annotated read-only or idempotent
+        '''
+        if request.method == Method.TOOLS_CALL:
+            return request.params.name in self.replayable_tools
+        return request.method in REPLAYABLE_METHODS
+
+    def _remember_tools(self, result: dict[str, Any]) -> None:
+        for tool in result.get("tools") or []:
+            annotations = tool.get("annotations") or {}
+            if annotations.get("readOnlyHint") or annotations.get("idempotentHint"):
+                self.replayable_tools.add(tool["name"])
+            else:
+                self.replayable_tools.discard(tool["name"])
+
+    def _on_list_changed(self, method: str) -> None:
+        if self.catalog is not None:
+            self.catalog.list_changed(method)
+        if self.on_list_changed is not None:
+            self.on_list_changed(method)
+
+    async def _fetch_list(self, method: str, cursor: Optional[str] = None) -> dict[str, Any]:
+        request_class = {
+            Method.TOOLS_LIST: ListToolsRequest,
+            Method.PROMPTS_LIST: ListPromptsRequest,
+            Method.RESOURCES_LIST: ListResourcesRequest,
+            Method.RESOURCES_TEMPLATES_LIST: ListResourceTemplatesRequest,
+        }[method]
+        params = PaginatedRequestParams(cursor=cursor) if cursor else None
+        response = await self._send(request_class(id=self.transport.next_request_id(), params=params))
+        if method == Method.TOOLS_LIST:
+            self._remember_tools(response.result)
+        return response.result
+
+    def _use_catalog(self, method: str, params: Optional[PaginatedRequestParams]) -> bool:
+        if self.catalog is None or not self.catalog.is_cacheable(method):
+            return False
+        return params is None or (params.cursor is None and params.meta is None)
+
+    async def _cached_list(self, method: str, model: type[BaseModel], result_mode: Optional[ResultMode], timeout: Optional[float], deadline: Optional[float]) -> Any:
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            timeout = remaining if timeout is None else min(timeout, remaining)
+        try:
+            async with asyncio.timeout(timeout):
+                entry = await self.catalog.get(method)
+        except TimeoutError:
+            raise MCPError(code=-1, message="Request timed out")
+        mode = result_mode or self.result_mode
+        if mode not in entry.parsed:
+            entry.parsed[mode] = self._parse_result(model, entry.result, mode)
+        return entry.parsed[mode]
+
+    def batch(self) -> RequestBatch:
+        '''
+        Collect requests to send to the server together
+
+        Returns:
+            A batch to use as an async context manager; requests are sent when the block exits
+        '''
+        return RequestBatch(self)
+
+    async def _send(
+        self,
+        request: JSONRPCRequest,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None,
+        progress_callback: Optional[ProgressFn] = None,
+        reset_timeout_on_progress: Optional[bool] = None,
+        track_progress: bool = False,
+    ) -> JSONRPCResultResponse:
+        '''
+        Send a request with an optional per-call timeout or deadline
+
+        Args:
+            request: The request to send
+            timeout: Seconds to wait for the response
+            deadline: Absolute `time.monotonic()` value by which the response must arrive
+            progress_callback: Called with each progress update of the request
+            reset_timeout_on_progress: Restart the timeout on every progress update
+            track_progress: Attach the request id as `progressToken` in the params `_meta`
+
+        Returns:
+            The response
+        '''
+        if request.method != Method.PING:
+            # Health check pings do not count as use of an idle session
+            self.last_used = time.monotonic()
+        handle = current_handle.get()
+        if handle is not None and handle.request_id is None:
+            handle.request_id = request.id
+        else:
+            handle = None
+        on_progress = None
+        if track_progress:
+            request.params = request.params.model_copy(update={"meta": {**(request.params.meta or {}), "progressToken": request.id}})
+            listeners = [callback for callback in (progress_callback, handle and handle.on_progress) if callback]
+            if listeners:
+                async def fan_out(params: ProgressNotificationParams) -> None:
+                    for listener in listeners:
+                        await listener(params=params)
+                on_progress = fan_out
+
+        replays = 0
+        while True:
+            await self._wait_connected()
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise MCPError(code=-1, message="Deadline exceeded")
+                timeout = remaining if timeout is None else min(timeout, remaining)
+            try:
+                return await self.transport.send_request(
+                    request=request,
+                    timeout=timeout,
+                    on_progress=on_progress,
+                    reset_timeout_on_progress=reset_timeout_on_progress,
+                )
+            except ConnectionLost as e:
+                if not e.partial:
+                    self._on_connection_lost(e.message)
+                # A partial loss leaves the transport usable, so replaying needs no reconnect policy
+                if self.closed or (self.reconnect_policy is None and not e.partial):
+                    raise
+                if not self.is_replayable(request):
+                    target = f"tool '{request.params.name}'" if request.method == Method.TOOLS_CALL else request.method
+                    raise ConnectionLost(f"{e.message}; {target} was not retried because it may not be idempotent") from e
+                if replays >= (self.reconnect_policy.max_replays if self.reconnect_policy else 1):
+                    raise
+                replays += 1
+                # A batch is flushed once; the replay is sent on its own
+                current_batch.set(None)
+
+    def _parse_result(self, model: type[BaseModel], result: Any, result_mode: Optional[ResultMode] = None) -> Any:
+        return parse_result(model, result, result_mode or self.result_mode)
+
     async def initialize(self) -> InitializeResult:
         PROTOCOL_VERSION = "2024-11-05"
         
@@ -70,7 +436,7 @@ class Session:
         )
         
         request = InitializeRequest(
-            id=str(uuid4()),
+            id=self.transport.next_request_id(),
             params=params
         )
         
@@ -80,101 +446,176 @@ class Session:
         await self.transport.send_notification(notification=notification)
         
         self.initialize_result = InitializeResult.model_validate(response.result)
+        restored, self.restored = self.restored, None
+        if self.catalog is not None:
+            # Catalogs restored from a snapshot stay valid if the server presents itself the same way
+            same_server = restored is not None and restored.initialize == self.dump_initialize_result()
+            self.catalog.configure(self.initialize_result.capabilities, keep_entries=same_server)
         return self.initialize_result
+
+    def dump_initialize_result(self) -> dict[str, Any]:
+        return self.initialize_result.model_dump(mode="json", by_alias=True, exclude_none=True)
     
-    async def ping(self) -> bool:
-        request = PingRequest(id=str(uuid4()))
-        response = await self.transport.send_request(request=request)
+    async def ping(self, timeout: Optional[float] = None, deadline: Optional[float] = None) -> bool:
+        request = PingRequest(id=self.transport.next_request_id())
+        response = await self._send(request, timeout, deadline)
         return response is not None
 
-    async def prompts_list(self, params: Optional[PaginatedRequestParams] = None) -> ListPromptsResult:
+    async def prompts_list(self, params: Optional[PaginatedRequestParams] = None, result_mode: Optional[ResultMode] = None, timeout: Optional[float] = None, deadline: Optional[float] = None) -> ListPromptsResult:
+        if self._use_catalog(Method.PROMPTS_LIST, params):
+            return await self._cached_list(Method.PROMPTS_LIST, ListPromptsResult, result_mode, timeout, deadline)
         request = ListPromptsRequest(
-            id=str(uuid4()),
+            id=self.transport.next_request_id(),
             params=params
         )
-        response = await self.transport.send_request(request=request)
-        return ListPromptsResult.model_validate(response.result)
+        response = await self._send(request, timeout, deadline)
+        return self._parse_result(ListPromptsResult, response.result, result_mode)
     
-    async def prompts_get(self, params: GetPromptRequestParams) -> GetPromptResult:
+    async def prompts_get(self, params: GetPromptRequestParams, result_mode: Optional[ResultMode] = None, timeout: Optional[float] = None, deadline: Optional[float] = None, progress_callback: Optional[ProgressFn] = None, reset_timeout_on_progress: Optional[bool] = None) -> GetPromptResult:
         request = GetPromptRequest(
-            id=str(uuid4()),
+            id=self.transport.next_request_id(),
             params=params
         )
-        response = await self.transport.send_request(request=request)
-        return GetPromptResult.model_validate(response.result)
+        response = await self._send(request, timeout, deadline, progress_callback, reset_timeout_on_progress, track_progress=True)
+        return self._parse_result(GetPromptResult, response.result, result_mode)
     
-    async def resources_list(self, params: Optional[PaginatedRequestParams] = None) -> ListResourcesResult:
+    async def resources_list(self, params: Optional[PaginatedRequestParams] = None, result_mode: Optional[ResultMode] = None, timeout: Optional[float] = None, deadline: Optional[float] = None) -> ListResourcesResult:
+        if self._use_catalog(Method.RESOURCES_LIST, params):
+            return await self._cached_list(Method.RESOURCES_LIST, ListResourcesResult, result_mode, timeout, deadline)
         request = ListResourcesRequest(
-            id=str(uuid4()),
+            id=self.transport.next_request_id(),
             params=params
         )
-        response = await self.transport.send_request(request=request)
-        return ListResourcesResult.model_validate(response.result)
+        response = await self._send(request, timeout, deadline)
+        return self._parse_result(ListResourcesResult, response.result, result_mode)
     
-    async def resources_read(self, params: ReadResourceRequestParams) -> ReadResourceResult:
+    async def resources_read(self, params: ReadResourceRequestParams, result_mode: Optional[ResultMode] = None, timeout: Optional[float] = None, deadline: Optional[float] = None, progress_callback: Optional[ProgressFn] = None, reset_timeout_on_progress: Optional[bool] = None) -> ReadResourceResult:
         request = ReadResourceRequest(
-            id=str(uuid4()),
+            id=self.transport.next_request_id(),
             params=params
         )
-        response = await self.transport.send_request(request=request)
-        return ReadResourceResult.model_validate(response.result)
+        response = await self._send(request, timeout, deadline, progress_callback, reset_timeout_on_progress, track_progress=True)
+        return self._parse_result(ReadResourceResult, response.result, result_mode)
     
-    async def resources_templates_list(self, params: Optional[PaginatedRequestParams] = None) -> ListResourceTemplatesResult:
+    async def resources_templates_list(self, params: Optional[PaginatedRequestParams] = None, result_mode: Optional[ResultMode] = None, timeout: Optional[float] = None, deadline: Optional[float] = None) -> ListResourceTemplatesResult:
+        if self._use_catalog(Method.RESOURCES_TEMPLATES_LIST, params):
+            return await self._cached_list(Method.RESOURCES_TEMPLATES_LIST, ListResourceTemplatesResult, result_mode, timeout, deadline)
         request = ListResourceTemplatesRequest(
-            id=str(uuid4()),
+            id=self.transport.next_request_id(),
             params=params
         )
-        response = await self.transport.send_request(request=request)
-        return ListResourceTemplatesResult.model_validate(response.result)
+        response = await self._send(request, timeout, deadline)
+        return self._parse_result(ListResourceTemplatesResult, response.result, result_mode)
     
-    async def resources_subscribe(self, params: SubscribeRequestParams) -> None:
+    async def resources_subscribe(self, params: SubscribeRequestParams, timeout: Optional[float] = None, deadline: Optional[float] = None) -> None:
         request = SubscribeRequest(
-            id=str(uuid4()),
+            id=self.transport.next_request_id(),
             params=params
         )
-        await self.transport.send_request(request=request)
+        await self._send(request, timeout, deadline)
 
-    async def resources_unsubscribe(self, params: UnsubscribeRequestParams) -> None:
+    async def resources_unsubscribe(self, params: UnsubscribeRequestParams, timeout: Optional[float] = None, deadline: Optional[float] = None) -> None:
         request = UnsubscribeRequest(
-            id=str(uuid4()),
+            id=self.transport.next_request_id(),
             params=params
         )
-        await self.transport.send_request(request=request)
+        await self._send(request, timeout, deadline)
     
-    async def tools_list(self, params: Optional[PaginatedRequestParams] = None) -> ListToolsResult:
+    async def tools_list(self, params: Optional[PaginatedRequestParams] = None, result_mode: Optional[ResultMode] = None, timeout: Optional[float] = None, deadline: Optional[float] = None) -> ListToolsResult:
+        if self._use_catalog(Method.TOOLS_LIST, params):
+            return await self._cached_list(Method.TOOLS_LIST, ListToolsResult, result_mode, timeout, deadline)
         request = ListToolsRequest(
-            id=str(uuid4()),
+            id=self.transport.next_request_id(),
             params=params
         )
-        response = await self.transport.send_request(request=request)
-        return ListToolsResult.model_validate(response.result)
+        response = await self._send(request, timeout, deadline)
+        self._remember_tools(response.result)
+        return self._parse_result(ListToolsResult, response.result, result_mode)
     
-    async def tools_call(self, params: CallToolRequestParams) -> CallToolResult:
+    async def tools_call(self, params: CallToolRequestParams, result_mode: Optional[ResultMode] = None, timeout: Optional[float] = None, deadline: Optional[float] = None, progress_callback: Optional[ProgressFn] = None, reset_timeout_on_progress: Optional[bool] = None) -> CallToolResult:
         request = CallToolRequest(
-            id=str(uuid4()),
+            id=self.transport.next_request_id(),
             params=params
         )
-        response = await self.transport.send_request(request=request)
-        return CallToolResult.model_validate(response.result)
+        response = await self._send(request, timeout, deadline, progress_callback, reset_timeout_on_progress, track_progress=True)
+        return self._parse_result(CallToolResult, response.result, result_mode)
     
+    async def tasks_list(self, params: Optional[PaginatedRequestParams] = None, result_mode: Optional[ResultMode] = None, timeout: Optional[float] = None, deadline: Optional[float] = None) -> ListTasksResult:
+        request = ListTasksRequest(
+            id=self.transport.next_request_id(),
+            params=params
+        )
+        response = await self._send(request, timeout, deadline)
+        return self._parse_result(ListTasksResult, response.result, result_mode)
+
+    def iter_tools(self, page_size: Optional[int] = None, limit: Optional[int] = None, result_mode: Optional[ResultMode] = None, timeout: Optional[float] = None) -> AsyncIterator[Tool]:
+        '''
+        Iterate over all tools of the server, page by page
+
+        Args:
+            page_size: Number of tools per page to ask for; servers may ignore it
+            limit: Maximum number of tools to yield
+            result_mode: How each tool is returned
+            timeout: Seconds to wait for each page
+
+        Returns:
+            An async iterator over the tools; use `contextlib.aclosing` to stop early without a pending page
+        '''
+        fetch = lambda params: self.tools_list(params, "raw", timeout)
+        return paginate(fetch, "tools", Tool, result_mode or self.result_mode, page_size, limit)
+
+    def iter_prompts(self, page_size: Optional[int] = None, limit: Optional[int] = None, result_mode: Optional[ResultMode] = None, timeout: Optional[float] = None) -> AsyncIterator[Prompt]:
+        '''Iterate over all prompts of the server, page by page; see `iter_tools`.'''
+        fetch = lambda params: self.prompts_list(params, "raw", timeout)
+        return paginate(fetch, "prompts", Prompt, result_mode or self.result_mode, page_size, limit)
+
+    def iter_resources(self, page_size: Optional[int] = None, limit: Optional[int] = None, result_mode: Optional[ResultMode] = None, timeout: Optional[float] = None) -> AsyncIterator[Resource]:
+        '''Iterate over all resources of the server, page by page; see `iter_tools`.'''
+        fetch = lambda params: self.resources_list(params, "raw", timeout)
+        return paginate(fetch, "resources", Resource, result_mode or self.result_mode, page_size, limit)
+
+    def iter_resource_templates(self, page_size: Optional[int] = None, limit: Optional[int] = None, result_mode: Optional[ResultMode] = None, timeout: Optional[float] = None) -> AsyncIterator[ResourceTemplate]:
+        '''Iterate over all resource templates of the server, page by page; see `iter_tools`.'''
+        fetch = lambda params: self.resources_templates_list(params, "raw", timeout)
+        return paginate(fetch, "resourceTemplates", ResourceTemplate, result_mode or self.result_mode, page_size, limit)
+
+    def iter_tasks(self, page_size: Optional[int] = None, limit: Optional[int] = None, result_mode: Optional[ResultMode] = None, timeout: Optional[float] = None) -> AsyncIterator[Task]:
+        '''Iterate over all tasks on the server, page by page; see `iter_tools`.'''
+        fetch = lambda params: self.tasks_list(params, "raw", timeout)
+        return paginate(fetch, "tasks", Task, result_mode or self.result_mode, page_size, limit)
+
     async def roots_list_changed(self) -> None:
         notification = RootsListChangedNotification()
         await self.transport.send_notification(notification=notification)
 
-    async def completion_complete(self, params: CompleteRequestParams) -> CompleteResult:
+    async def completion_complete(self, params: CompleteRequestParams, result_mode: Optional[ResultMode] = None, timeout: Optional[float] = None, deadline: Optional[float] = None) -> CompleteResult:
         request = CompleteRequest(
-            id=str(uuid4()),
+            id=self.transport.next_request_id(),
             params=params
         )
-        response = await self.transport.send_request(request=request)
-        return CompleteResult.model_validate(response.result)
+        response = await self._send(request, timeout, deadline)
+        return self._parse_result(CompleteResult, response.result, result_mode)
 
-    async def logging_set_level(self, params: SetLevelRequestParams) -> None:
+    async def logging_set_level(self, params: SetLevelRequestParams, timeout: Optional[float] = None, deadline: Optional[float] = None) -> None:
         request = SetLevelRequest(
-            id=str(uuid4()),
+            id=self.transport.next_request_id(),
             params=params
         )
-        await self.transport.send_request(request=request)
+        await self._send(request, timeout, deadline)
 
     async def shutdown(self) -> None:
+        if self.catalog is not None:
+            self.catalog.clear()
+        if self.startup_task is not None and not self.startup_task.done():
+            self.startup_task.cancel()
+            try:
+                await self.startup_task
+            except BaseException:
+                pass
+        if self.reconnect_task is not None and not self.reconnect_task.done():
+            self.reconnect_task.cancel()
+            try:
+                await self.reconnect_task
+            except asyncio.CancelledError:
+                pass
         await self.transport.disconnect()
\ No newline at end of file
@@ -0,0 +1,133 @@
+from src.mcp.transport.codec import JSONCodec, get_codec
+from src.mcp.logger import get_logger
+from dataclasses import dataclass, field
+from typing import Any, Optional
+import asyncio
+import hashlib
+import json
+import os
+import struct
+import time
+import zlib
+
+logger = get_logger(__name__)
+
+MAGIC = b"MCPS"
+FORMAT_VERSION = 2
+HEADER = struct.Struct("<4sBI")
+"""Magic, format version and payload length ahead of the zlib payload."""
+
+DEFAULT_DIRECTORY = os.path.join("~", ".cache", "mcp-client", "catalogs")
+
+
+@dataclass
+class CatalogSnapshot:
+    """
+    What a server reported the last time it was started: its initialize
+    result and the full result of each list method, all pages merged.
+    """
+    initialize: dict[str, Any]
+    catalogs: dict[str, dict[str, Any]] = field(default_factory=dict)
+    created: float = field(default_factory=time.time)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"initialize": self.initialize, "catalogs": self.catalogs, "created": self.created}
+
+
+class SnapshotStore:
+    """
+    Catalog snapshots on disk, one file per server configuration.
+
+    A file is named after a hash of the server's configuration entry, so
+    editing the entry starts from scratch. The session started from a
+    snapshot compares its initialize result, which holds the server version,
+    and catalogs with the live server and replaces the snapshot when either
+    changed. The payload is zlib-compressed JSON, and files
+    are replaced atomically so concurrent clients never read a partial one.
+    """
+
+    def __init__(self, directory: str = DEFAULT_DIRECTORY, codec: str | JSONCodec | None = None) -> None:
+        self.directory = os.path.expanduser(directory)
+        self.codec = get_codec(codec)
+
+    @classmethod
+    def from_config(cls, config: bool | dict[str, Any] | None) -> Optional['SnapshotStore']:
+        '''
+        Build a store from the `catalogSnapshots` entry of the client configuration
+
+        Args:
+            config: True for the default directory, a dict of settings (e.g. {"directory": ...}), or None/False to disable
+
+        Returns:
+            The store, or None if servers always start from scratch
+        '''
+        if not config:
+            return None
+        if config is True:
+            return cls()
+        return cls(**config)
+
+    @staticmethod
+    def config_key(server_config: dict[str, Any]) -> str:
+        canonical = json.dumps(server_config, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(canonical.encode()).hexdigest()[:32]
+
+    def path(self, server_config: dict[str, Any]) -> str:
+        return os.path.join(self.directory, f"{self.config_key(server_config)}.snap")
+
+    def encode(self, snapshot: CatalogSnapshot) -> bytes:
+        payload = zlib.compress(self.codec.dumps(snapshot.to_dict()))
+        return HEADER.pack(MAGIC, FORMAT_VERSION, len(payload)) + payload
+
+    def decode(self, data: bytes) -> CatalogSnapshot:
+        magic, version, length = HEADER.unpack_from(data)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError("Not a catalog snapshot of this format")
+        payload = data[HEADER.size:HEADER.size + length]
+        if len(payload) != length:
+            raise ValueError("Truncated catalog snapshot")
+        return CatalogSnapshot(**self.codec.loads(zlib.decompress(payload)))
+
+    def read(self, server_config: dict[str, Any]) -> Optional[CatalogSnapshot]:
+        path = self.path(server_config)
+        try:
+            with open(path, "rb") as f:
+                return self.decode(f.read())
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable catalog snapshot {path}: {e}")
+            return None
+
+    def write(self, server_config: dict[str, Any], snapshot: CatalogSnapshot) -> None:
+        path = self.path(server_config)
+        os.makedirs(self.directory, exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as f:
+            f.write(self.encode(snapshot))
+        os.replace(temporary, path)
+
+    async def load(self, server_config: dict[str, Any]) -> Optional[CatalogSnapshot]:
+        '''
+        Read the snapshot of a server configuration
+
+        Args:
+            server_config: The server's configuration entry
+
+        Returns:
+            The snapshot, or None if there is none or it cannot be read
+        '''
+        return await asyncio.to_thread(self.read, server_config)
+
+    async def save(self, server_config: dict[str, Any], snapshot: CatalogSnapshot) -> None:
+        '''
+        Store the snapshot of a server configuration, replacing the previous one
+
+        Args:
+            server_config: The server's configuration entry
+            snapshot: The snapshot to store
+        '''
+        try:
+            await asyncio.to_thread(self.write, server_config, snapshot)
+        except OSError as e:
+            logger.warning(f"Failed to save catalog snapshot: {e}")
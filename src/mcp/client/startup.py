@@ -0,0 +1,97 @@
+from dataclasses import dataclass, field
+from typing import Optional
+import asyncio
+
+
+@dataclass
+class ServerStartup:
+    """
+    Outcome of starting one server: durations in seconds of connecting the
+    transport and of the initialize handshake, or the error that stopped it.
+
+    A server restored from a catalog snapshot starts in the background; its
+    entry is pending until that startup completes and is filled in then.
+    """
+    name: str
+    connect_time: Optional[float] = None
+    initialize_time: Optional[float] = None
+    error: Optional[str] = None
+    task: Optional[asyncio.Task] = field(default=None, repr=False, compare=False)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.pending
+
+    @property
+    def pending(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+    @property
+    def restored(self) -> bool:
+        return self.task is not None
+
+    @property
+    def total_time(self) -> float:
+        return (self.connect_time or 0) + (self.initialize_time or 0)
+
+    def follow(self, task: asyncio.Task) -> None:
+        '''
+        Record the outcome of a startup running in the background
+
+        Args:
+            task: The startup task, resulting in the connect and initialize durations
+        '''
+        self.task = task
+        task.add_done_callback(self._finished)
+
+    def _finished(self, task: asyncio.Task) -> None:
+        if task.cancelled():
+            self.error = "Startup cancelled"
+        elif (e := task.exception()) is not None:
+            self.error = str(e) or type(e).__name__
+        else:
+            self.connect_time, self.initialize_time = task.result()
+
+
+@dataclass
+class StartupReport:
+    """
+    Result of `MCPClient.create_all_sessions`, one entry per configured server.
+    """
+    servers: dict[str, ServerStartup] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+    @property
+    def succeeded(self) -> list[str]:
+        return [name for name, startup in self.servers.items() if startup.ok]
+
+    @property
+    def failed(self) -> dict[str, str]:
+        return {name: startup.error for name, startup in self.servers.items() if startup.error is not None}
+
+    @property
+    def pending(self) -> list[str]:
+        return [name for name, startup in self.servers.items() if startup.pending]
+
+    async def wait(self) -> 'StartupReport':
+        '''
+        Wait for the servers still starting in the background
+
+        Returns:
+            This report, with every entry filled in
+        '''
+        tasks = [startup.task for startup in self.servers.values() if startup.pending]
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return self
+
+    def __str__(self) -> str:
+        lines = [f"Started {len(self.succeeded)}/{len(self.servers)} servers in {self.elapsed:.2f}s"]
+        for startup in self.servers.values():
+            restored = " (restored from snapshot)" if startup.restored else ""
+            if startup.pending:
+                lines.append(f"  {startup.name}: restored from snapshot, still starting")
+            elif startup.ok:
+                lines.append(f"  {startup.name}: connect {startup.connect_time:.3f}s, initialize {startup.initialize_time:.3f}s{restored}")
+            else:
+                lines.append(f"  {startup.name}: failed: {startup.error}{restored}")
+        return "\n".join(lines)
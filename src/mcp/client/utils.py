@@ -3,31 +3,125 @@ from src.mcp.transport.streamable_http import StreamableHTTPTransport
 from src.mcp.transport.websocket import WebSocketTransport
 from src.mcp.transport.sse import SSETransport
 from src.mcp.transport.base import BaseTransport
-from typing import Any
+from src.mcp.transport.pooled import PooledTransport
+from src.mcp.transport.balanced import BalancedTransport
+from src.mcp.transport.pool import HTTPClientPool,PoolLimits
+from src.mcp.transport.framing import DEFAULT_MAX_MESSAGE_SIZE
+from typing import Any,Optional
 
-def create_transport_from_server_config(server_config:dict[str,Any])->BaseTransport:
+def create_transport_from_server_config(server_config:dict[str,Any],http_pool:Optional[HTTPClientPool]=None)->BaseTransport:
     '''
     Create a transport based on the server configuration
 
     Args:
         server_config: The server configuration
+        http_pool: Pool of HTTP clients shared with other HTTP transports
 
     Returns:
         The transport instance for the server
     '''
+    options=get_transport_options(server_config)
+    if 'urls' in server_config:
+        endpoints=get_endpoint_configs(server_config)
+        return BalancedTransport(
+            factory=lambda index:create_transport_from_server_config(endpoints[index],http_pool),
+            urls=[endpoint['url'] for endpoint in endpoints],
+            alpha=server_config.get('balance_alpha',0.3),
+            eject_after=server_config.get('eject_after',3),
+            probe_interval=server_config.get('probe_interval',1.0),
+            max_probe_interval=server_config.get('max_probe_interval',30.0),
+            **options,
+        )
     if is_sse_transport(server_config):
-        return SSETransport(**server_config)
+        return SSETransport(
+            url=server_config['url'],
+            headers=server_config.get('headers'),
+            http_timeout=server_config.get('http_timeout',30),
+            http_pool=http_pool,
+            pool_limits=PoolLimits.from_config(server_config),
+            **options,
+        )
     elif is_stdio_transport(server_config):
         params=StdioServerParams(**server_config)
-        return StdioTransport(params=params)
+        def create_stdio(index:int=0)->StdioTransport:
+            return StdioTransport(
+                params=params,
+                stderr_lines=server_config.get('stderr_lines',1000),
+                forward_stderr=server_config.get('forward_stderr',False),
+                max_message_size=server_config.get('max_message_size',DEFAULT_MAX_MESSAGE_SIZE),
+                write_queue_size=server_config.get('write_queue_size',1024),
+                **options,
+            )
+        replicas=server_config.get('replicas',1)
+        if replicas>1:
+            return PooledTransport(
+                factory=create_stdio,
+                size=replicas,
+                replace_attempts=server_config.get('replace_attempts',5),
+                replace_delay=server_config.get('replace_delay',0.5),
+                **options,
+            )
+        return create_stdio()
     elif is_streamable_http_transport(server_config):
-        return StreamableHTTPTransport(**server_config)
+        return StreamableHTTPTransport(
+            url=server_config['url'],
+            headers=server_config.get('headers'),
+            http_timeout=server_config.get('http_timeout',30),
+            listen_stream=server_config.get('listen_stream',False),
+            reconnect_attempts=server_config.get('reconnect_attempts',5),
+            reconnect_delay=server_config.get('reconnect_delay',0.05),
+            http_pool=http_pool,
+            pool_limits=PoolLimits.from_config(server_config),
+            **options,
+        )
     elif is_websocket_transport(server_config):
-        return WebSocketTransport(**server_config)
+        return WebSocketTransport(
+            url=server_config['url'],
+            headers=server_config.get('headers'),
+            max_message_size=server_config.get('max_message_size',DEFAULT_MAX_MESSAGE_SIZE),
+            ping_interval=server_config.get('ping_interval',20),
+            ping_timeout=server_config.get('ping_timeout',20),
+            compression=server_config.get('compression','deflate'),
+            compression_level=server_config.get('compression_level'),
+            write_queue_size=server_config.get('write_queue_size',1024),
+            **options,
+        )
     else:
         raise ValueError(f'Invalid server configuration: {server_config}')
 
 
+TRANSPORT_OPTIONS=('codec','max_concurrent_requests','timeout','method_timeouts','reset_timeout_on_progress','batch_requests')
+
+def get_transport_options(server_config:dict[str,Any])->dict[str,Any]:
+    '''
+    Collect the options shared by all transports from the server configuration
+
+    Args:
+        server_config: The server configuration
+
+    Returns:
+        Keyword arguments for the BaseTransport constructor
+    '''
+    return {key:server_config[key] for key in TRANSPORT_OPTIONS if key in server_config}
+
+def get_endpoint_configs(server_config:dict[str,Any])->list[dict[str,Any]]:
+    '''
+    Split a server configuration with a `urls` list into one configuration per URL
+
+    Args:
+        server_config: The server configuration
+
+    Returns:
+        One configuration with a single `url` per endpoint, or the configuration itself
+    '''
+    if 'urls' not in server_config:
+        return [server_config]
+    base={key:value for key,value in server_config.items() if key!='urls'}
+    return [{**base,'url':url} for url in server_config['urls']]
+
+def is_http_transport(server_config:dict[str,Any])->bool:
+    return 'url' in server_config and server_config.get('url').startswith(('http://','https://'))
+
 def is_sse_transport(server_config:dict[str,Any])->bool:
     return 'url' in server_config and 'sse' in server_config.get('url')
 
@@ -39,4 +133,4 @@ def is_stdio_transport(server_config:dict[str,Any])->bool:
 
 def is_websocket_transport(server_config:dict[str,Any])->bool:
     return 'url' in server_config and 'ws' in server_config.get('url')
-    
\ No newline at end of file
+    
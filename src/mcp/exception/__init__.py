@@ -4,4 +4,19 @@ class MCPError(Exception):
     def __init__(self, code:int, message:str):
         self.code = code
         self.message = message
-        super().__init__(f'JSON-RPC Error {code}: {message}')
\ No newline at end of file
+        super().__init__(f'JSON-RPC Error {code}: {message}')
+
+class ConnectionLost(MCPError):
+    '''Connection to the MCP server ended unexpectedly
+
+    `partial` is set when only one member of a pooled transport was lost and
+    the transport as a whole is still usable.
+    '''
+    def __init__(self, message:str='Connection lost', partial:bool=False):
+        self.partial = partial
+        super().__init__(code=-1, message=message)
+
+class ServerFailure(MCPError):
+    '''The server failed to handle a request below the protocol level, e.g. with an HTTP 5xx reply'''
+    def __init__(self, message:str):
+        super().__init__(code=-1, message=message)
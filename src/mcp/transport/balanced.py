@@ -0,0 +1,213 @@
+from src.mcp.types.json_rpc import JSONRPCMessage, JSONRPCResponse
+from src.mcp.types.notification import ProgressFn
+from src.mcp.transport.base import BaseTransport
+from src.mcp.transport.pooled import PooledTransport
+from src.mcp.exception import MCPError, ConnectionLost, ServerFailure
+from src.mcp.logger import get_logger
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+import asyncio
+import random
+import time
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class EndpointStats:
+    """
+    Load and reliability of one endpoint of a balanced transport.
+
+    `rtt` is an exponentially weighted moving average of the response times
+    in seconds; each response moves it by `alpha` towards the latest one.
+    """
+    url: str
+    rtt: Optional[float] = None
+    consecutive_failures: int = 0
+    ejections: int = 0
+    ejected: bool = False
+
+    def record(self, rtt: Optional[float], alpha: float) -> None:
+        if rtt is None:
+            self.consecutive_failures += 1
+            return
+        self.consecutive_failures = 0
+        self.rtt = rtt if self.rtt is None else self.rtt + alpha * (rtt - self.rtt)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'url': self.url,
+            'rtt': self.rtt,
+            'ejected': self.ejected,
+            'ejections': self.ejections,
+        }
+
+
+class BalancedTransport(PooledTransport):
+    """
+    One logical connection to a server reachable at several URLs, each
+    endpoint with its own initialized session.
+
+    Requests are routed by power of two choices: two live endpoints are
+    picked at random and the one with the lower cost, its RTT average times
+    its requests in flight plus one, gets the request. An endpoint without a
+    measured RTT is assumed to have the average RTT of the others.
+
+    An endpoint is ejected when its connection is lost or after
+    `eject_after` consecutive transport failures (lost connections, HTTP
+    5xx replies). A request's own timeout or an HTTP 4xx reply does not
+    count: the endpoint may just be slow or the request wrong.
+    Its requests in flight fail with a partial `ConnectionLost`, and it is
+    probed back in by reconnecting and initializing it again, every
+    `probe_interval` seconds doubling up to `max_probe_interval`. The
+    connection as a whole is lost when every endpoint is ejected.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[int], BaseTransport],
+        urls: list[str],
+        alpha: float = 0.3,
+        eject_after: int = 3,
+        probe_interval: float = 1.0,
+        max_probe_interval: float = 30.0,
+        **kwargs,
+    ):
+        super().__init__(factory, size=len(urls), **kwargs)
+        self.urls = urls
+        self.alpha = alpha
+        self.eject_after = eject_after
+        self.probe_interval = probe_interval
+        self.max_probe_interval = max_probe_interval
+        self.stats = [EndpointStats(url) for url in urls]
+
+    async def connect(self) -> None:
+        """Connect every endpoint; those that fail are ejected and probed."""
+        self.closing = False
+        self.initialized = False
+        # The session initializes the new connection itself
+        self.initialize_request = None
+        self.stats = [EndpointStats(url) for url in self.urls]
+        self.members = [None] * self.size
+        results = await asyncio.gather(*(self.start_member(index) for index in range(self.size)), return_exceptions=True)
+        errors = []
+        for index, result in enumerate(results):
+            if isinstance(result, BaseException):
+                errors.append(result)
+                logger.warning(f"Endpoint {self.urls[index]} failed to connect: {result}")
+                self.stats[index].ejected = True
+                self.spawn(self.probe(index))
+            else:
+                self.members[index] = result
+        if not self.live_members():
+            await self.disconnect()
+            raise errors[0]
+
+    def cost(self, index: int) -> tuple[float, int]:
+        in_flight = len(self.members[index].pending)
+        rtt = self.stats[index].rtt
+        if rtt is None:
+            known = [stats.rtt for stats in self.stats if stats.rtt is not None]
+            rtt = sum(known) / len(known) if known else 0.0
+        return rtt * (in_flight + 1), in_flight
+
+    def choose(self, candidates: list[int]) -> int:
+        '''
+        Pick the endpoint for a request by power of two choices
+
+        Args:
+            candidates: Indexes of the live endpoints
+
+        Returns:
+            The cheaper of two endpoints picked at random
+        '''
+        if len(candidates) == 1:
+            return candidates[0]
+        return min(random.sample(candidates, 2), key=self.cost)
+
+    async def send_to(
+        self,
+        index: int,
+        request: JSONRPCMessage,
+        timeout: Optional[float] = None,
+        on_progress: Optional[ProgressFn] = None,
+        reset_timeout_on_progress: Optional[bool] = None,
+    ) -> JSONRPCResponse | None:
+        """
+        Send a routed request and fold its outcome into the endpoint's stats.
+        """
+        member = self.members[index]
+        stats = self.stats[index]
+        start = time.perf_counter()
+        try:
+            response = await member.send_request(request, timeout=timeout, on_progress=on_progress, reset_timeout_on_progress=reset_timeout_on_progress)
+        except (ConnectionLost, ServerFailure) as e:
+            stats.record(None, self.alpha)
+            if stats.consecutive_failures >= self.eject_after:
+                self.eject(index, member, f"{stats.consecutive_failures} consecutive failures, last: {e.message}")
+            raise
+        except MCPError as e:
+            # Error responses of the server prove the endpoint works; code -1 is the transport's
+            # own, a timeout of this request or a client error, which say nothing about the endpoint
+            if e.code != -1:
+                stats.record(time.perf_counter() - start, self.alpha)
+            raise
+        stats.record(time.perf_counter() - start, self.alpha)
+        return response
+
+    def member_lost(self, index: int, member: BaseTransport, reason: str) -> None:
+        self.eject(index, member, reason)
+
+    def eject(self, index: int, member: BaseTransport, reason: str) -> None:
+        '''
+        Stop routing to an endpoint and start probing it
+
+        Args:
+            index: Position of the endpoint
+            member: Its current transport, ignored if already replaced
+            reason: Why the endpoint is ejected
+        '''
+        if self.closing or index >= len(self.members) or self.members[index] is not member:
+            return
+        logger.warning(f"Ejecting endpoint {self.urls[index]}: {reason}")
+        self.members[index] = None
+        self.stats[index].ejected = True
+        self.stats[index].ejections += 1
+        member.correlator.fail_all(ConnectionLost(f"Endpoint ejected: {reason}"))
+        self.affinity_map = {key: i for key, i in self.affinity_map.items() if i != index}
+        self.spawn(self.replace(index, member))
+        if not self.live_members():
+            self.connection_lost(f"All {self.size} endpoints ejected")
+
+    async def replace(self, index: int, member: BaseTransport) -> None:
+        try:
+            await member.disconnect()
+        except Exception as e:
+            logger.warning(f"Error disconnecting endpoint {self.urls[index]}: {e}")
+        await self.probe(index)
+
+    async def probe(self, index: int) -> None:
+        '''
+        Reconnect an ejected endpoint until it answers, then route to it again
+
+        Args:
+            index: Position of the endpoint
+        '''
+        delay = self.probe_interval
+        while not self.closing:
+            await asyncio.sleep(delay)
+            if self.closing:
+                return
+            try:
+                member = await self.start_member(index)
+            except Exception as e:
+                logger.debug(f"Probe of endpoint {self.urls[index]} failed: {e}")
+                delay = min(delay * 2, self.max_probe_interval)
+                continue
+            if self.closing:
+                await member.disconnect()
+                return
+            self.members[index] = member
+            self.stats[index] = EndpointStats(self.urls[index], ejections=self.stats[index].ejections)
+            logger.info(f"Endpoint {self.urls[index]} is back")
+            return
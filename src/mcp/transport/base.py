@@ -1,19 +1,171 @@
-from src.mcp.types.json_rpc import JSONRPCMessage,JSONRPCResponse
-from src.mcp.exception import MCPError
-from src.mcp.exception import MCPError
+from src.mcp.types.json_rpc import JSONRPCMessage, JSONRPCRequest, JSONRPCNotification, JSONRPCResponse, JSONRPCResultResponse, JSONRPCErrorResponse, Error
+from src.mcp.types.common import RequestId, ProgressToken
+from src.mcp.types.notification import CancelledNotification, CancelledNotificationParams, ProgressFn, ProgressNotificationParams
+from src.mcp.transport.codec import JSONCodec, get_codec
+from src.mcp.transport.framing import OversizedMessage
+from src.mcp.exception import MCPError, ConnectionLost
+from src.mcp.logger import get_logger
 from abc import ABC, abstractmethod
-from typing import Callable
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Optional
+from itertools import count
+import asyncio
+
+logger = get_logger(__name__)
+
+
+class MessageBatch:
+    """
+    Requests collected for a single write instead of being sent one by one.
+
+    While a batch is the `current_batch` of a task, `send_request` on the
+    batch's transport appends the request here and only waits for the
+    response; the owner of the batch sends everything with `send_batch`.
+    """
+
+    def __init__(self, transport: "BaseTransport") -> None:
+        self.transport = transport
+        self.messages: list[JSONRPCMessage] = []
+        self.added = asyncio.Event()
+
+    def add(self, message: JSONRPCMessage) -> None:
+        self.messages.append(message)
+        self.added.set()
+
+    def __len__(self) -> int:
+        return len(self.messages)
+
+
+current_batch: ContextVar[Optional[MessageBatch]] = ContextVar("current_batch", default=None)
+
+class RequestCorrelator:
+    """
+    Tracks in-flight JSON-RPC requests and matches responses to them.
+
+    Request ids are allocated from a monotonically increasing integer counter.
+    Ids echoed back by the server are normalized before lookup, so a numeric
+    id that comes back as a string still resolves its request.
+    """
+
+    def __init__(self) -> None:
+        self._ids = count(1)
+        self.pending: dict[RequestId, asyncio.Future] = {}
+
+    def next_id(self) -> int:
+        return next(self._ids)
+
+    @staticmethod
+    def normalize_id(request_id: Any) -> RequestId:
+        if isinstance(request_id, str) and request_id.isascii() and request_id.isdigit():
+            return int(request_id)
+        return request_id
+
+    def register(self, request_id: RequestId) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        self.pending[self.normalize_id(request_id)] = future
+        return future
+
+    def resolve(self, request_id: Any, message: JSONRPCResponse) -> bool:
+        """
+        Resolve the future waiting on `request_id`.
+
+        Returns:
+            True if a waiting request was found, False for late or unknown responses.
+        """
+        future = self.pending.pop(self.normalize_id(request_id), None)
+        if future is None or future.done():
+            return False
+        future.set_result(message)
+        return True
+
+    def discard(self, request_id: RequestId) -> None:
+        self.pending.pop(self.normalize_id(request_id), None)
+
+    def fail_all(self, error: Exception) -> None:
+        for future in self.pending.values():
+            if not future.done():
+                future.set_exception(error)
+        self.pending.clear()
+
+    def cancel_all(self) -> None:
+        for future in self.pending.values():
+            if not future.done():
+                future.cancel()
+        self.pending.clear()
+
+    def __len__(self) -> int:
+        return len(self.pending)
+
 
 class BaseTransport(ABC):
     """
     Abstract base class for all MCP transport implementations.
     Provides the minimal interface for sending requests,
     sending notifications, and listening for incoming messages.
+
+    Request/response correlation and dispatching of incoming messages are
+    shared by every transport; subclasses only implement the wire framing
+    through `send_message` and feed decoded messages to `dispatch`.
+    Messages are converted to and from bytes with the transport's `codec`.
+
+    Requests initiated by the server (sampling, elicitation, roots) run as
+    separate tasks, at most `max_concurrent_requests` at a time, so a slow
+    callback never holds up the read loop.
+
+    Requests time out after `timeout` seconds unless `method_timeouts` has an
+    entry for the method or the caller passes its own timeout. A timed-out
+    request is cancelled on the server with `notifications/cancelled`, and so
+    is a request whose caller is cancelled while waiting for the response.
+
+    `notifications/progress` is routed to the request whose id is the progress
+    token. With `reset_timeout_on_progress`, each progress update restarts the
+    request's timeout, so long-running calls only fail when they go quiet.
+
+    With `batch_requests`, a `MessageBatch` is written as one JSON-RPC array;
+    otherwise, or once the server rejects an array, its requests are written
+    individually without waiting for each other's responses.
+
+    When the connection ends without `disconnect` (the server process exits,
+    a socket or stream drops), subclasses call `connection_lost`: pending
+    requests raise `ConnectionLost` and `on_connection_lost` is notified.
+
+    Tool, prompt and resource list_changed notifications are passed to
+    `on_list_changed` with the notification method.
     """
 
+    def __init__(self, codec: str | JSONCodec | None = None, max_concurrent_requests: int = 16, timeout: float = 30, method_timeouts: Optional[dict[str, float]] = None, reset_timeout_on_progress: bool = False, batch_requests: bool = False) -> None:
+        self.callbacks: dict[str, Callable] = {}
+        self.correlator = RequestCorrelator()
+        self.codec = get_codec(codec)
+        self.timeout = timeout
+        self.method_timeouts = method_timeouts or {}
+        self.reset_timeout_on_progress = reset_timeout_on_progress
+        self.batch_requests = batch_requests
+        self.on_connection_lost: Optional[Callable[[str], None]] = None
+        self.on_list_changed: Optional[Callable[[str], None]] = None
+        self.progress_handlers: dict[ProgressToken, Callable[[ProgressNotificationParams], Awaitable[None]]] = {}
+        self.request_semaphore = asyncio.Semaphore(max_concurrent_requests)
+        self.request_tasks: set[asyncio.Task] = set()
+
+    @property
+    def pending(self) -> dict[RequestId, asyncio.Future]:
+        return self.correlator.pending
+
     def attach_callbacks(self, callbacks:dict[str,Callable]):
         self.callbacks = callbacks
 
+    def get_stderr(self) -> list[str]:
+        """
+        Return recent diagnostic output of the server, if the transport captures any.
+        """
+        return []
+
+    def next_request_id(self) -> int:
+        """
+        Allocate a new request id, unique for the lifetime of this transport.
+        """
+        return self.correlator.next_id()
+
     @abstractmethod
     async def connect(self) -> None:
         """
@@ -29,14 +181,33 @@ class BaseTransport(ABC):
         pass
 
     @abstractmethod
+    async def send_message(self, message: JSONRPCMessage | list[JSONRPCMessage]) -> None:
+        """
+        Write a single JSON-RPC message, or a batch array of messages, to the MCP server.
+
+        Args:
+            message: JSONRPCMessage object, or a list of them for a batch
+
+        Raises:
+            MCPError: If the transport is not connected.
+        """
+        pass
+
     async def send_request(
-        self, request: JSONRPCMessage
+        self,
+        request: JSONRPCMessage,
+        timeout: Optional[float] = None,
+        on_progress: Optional[ProgressFn] = None,
+        reset_timeout_on_progress: Optional[bool] = None,
     ) -> JSONRPCResponse | None:
         """
         Send a JSON-RPC request to the MCP server and wait for a response.
 
         Args:
             request: JSONRPCMessage object
+            timeout: Seconds to wait for the response, defaults to the method or transport timeout
+            on_progress: Called with each progress update whose token is the request id
+            reset_timeout_on_progress: Restart the timeout on every progress update, defaults to the transport setting
 
         Returns:
             JSONRPCResponse or None
@@ -45,9 +216,100 @@ class BaseTransport(ABC):
             TimeoutError: If the request times out.
             Exception: If the request fails.
         """
-        pass
+        if timeout is None:
+            timeout = self.method_timeouts.get(request.method, self.timeout)
+        if reset_timeout_on_progress is None:
+            reset_timeout_on_progress = self.reset_timeout_on_progress
+        future = self.correlator.register(request.id)
+        try:
+            async with asyncio.timeout(timeout) as deadline:
+                if on_progress is not None or reset_timeout_on_progress:
+                    self.progress_handlers[self.correlator.normalize_id(request.id)] = self._progress_handler(
+                        deadline, timeout if reset_timeout_on_progress else None, on_progress
+                    )
+                batch = current_batch.get()
+                if batch is not None and batch.transport is self:
+                    batch.add(request)
+                else:
+                    await self.send_message(request)
+                response = await future
+        except TimeoutError:
+            await self.send_cancelled(request.id, reason=f"Request timed out after {timeout}s")
+            raise MCPError(code=-1, message="Request timed out")
+        except asyncio.CancelledError as e:
+            # Only a cancelled caller is reported; futures cancelled by disconnect are not
+            task = asyncio.current_task()
+            if task is not None and task.cancelling() and request.method != "initialize":
+                reason = e.args[0] if e.args else "Request cancelled by client"
+                self.spawn(self.send_cancelled(request.id, reason=reason))
+            raise
+        finally:
+            self.correlator.discard(request.id)
+            self.progress_handlers.pop(self.correlator.normalize_id(request.id), None)
+            if future.done() and not future.cancelled():
+                # A connection lost while sending fails the future too; mark it retrieved
+                future.exception()
+
+        if isinstance(response, JSONRPCErrorResponse):
+            raise MCPError(code=response.error.code, message=response.error.message)
+
+        return response
+
+    async def send_batch(self, messages: list[JSONRPCMessage]) -> None:
+        """
+        Send collected requests as one JSON-RPC array if `batch_requests` is
+        enabled, falling back to individual sends. A request whose send fails
+        is resolved with the error instead of waiting for its timeout.
+        """
+        if not messages:
+            return
+        if self.batch_requests and len(messages) > 1:
+            try:
+                await self.send_message(messages)
+                return
+            except MCPError as e:
+                logger.warning(f"Server rejected a JSON-RPC batch, sending requests individually: {e.message}")
+                self.batch_requests = False
+            except Exception as e:
+                for message in messages:
+                    self.fail_request(message.id, f"Failed to send request: {e}")
+                return
+
+        async def send(message: JSONRPCMessage) -> None:
+            try:
+                await self.send_message(message)
+            except Exception as e:
+                self.fail_request(message.id, f"Failed to send request: {e}")
+
+        await asyncio.gather(*(send(message) for message in messages))
+
+    def _progress_handler(self, deadline: asyncio.Timeout, timeout: Optional[float], on_progress: Optional[ProgressFn]) -> Callable[[ProgressNotificationParams], Awaitable[None]]:
+        async def handle_progress(params: ProgressNotificationParams) -> None:
+            if timeout is not None:
+                deadline.reschedule(asyncio.get_running_loop().time() + timeout)
+            if on_progress is not None:
+                await on_progress(params=params)
+        return handle_progress
+
+    def spawn(self, coro) -> asyncio.Task:
+        """
+        Run a coroutine in the background, cancelled by `cancel_inflight`.
+        """
+        task = asyncio.create_task(coro)
+        self.request_tasks.add(task)
+        task.add_done_callback(self.request_tasks.discard)
+        return task
+
+    async def send_cancelled(self, request_id: RequestId, reason: Optional[str] = None) -> None:
+        """
+        Tell the server to stop working on a request. Failures are logged, not raised.
+        """
+        notification = CancelledNotification(params=CancelledNotificationParams(requestId=request_id, reason=reason))
+        try:
+            await self.send_notification(notification)
+        except Exception as e:
+            logger.warning(f"Failed to send cancellation for request {request_id}: {e}")
 
-    @abstractmethod
     async def send_notification(self, notification: JSONRPCMessage) -> None:
         """
         Send a JSON-RPC notification to the MCP server.
@@ -55,14 +317,99 @@ class BaseTransport(ABC):
         Args:
             notification: JSONRPCMessage object
         """
-        pass
+        await self.send_message(notification)
 
-    @abstractmethod
     async def send_response(self, response: JSONRPCResponse) -> None:
         """
         Send a JSON-RPC response to the MCP server.
         """
-        pass
+        await self.send_message(response)
+
+    async def dispatch(self, content: dict[str, Any] | list[dict[str, Any]]) -> None:
+        """
+        Route a decoded JSON-RPC message, or batch array, from the MCP server.
+
+        Responses resolve their pending request, requests are handed to
+        `handle_request` and answered, notifications go to `handle_notification`.
+        """
+        if isinstance(content, list): # Batch
+            for item in content:
+                await self.dispatch(item)
+
+        elif "result" in content: # Response
+            # `result` is untyped at this level, so the envelope is built without
+            # validation; Session validates the payload against the expected model.
+            message = JSONRPCResultResponse.model_construct(**content)
+            self.correlator.resolve(content.get("id"), message)
+
+        elif "error" in content: # Error
+            error = Error.model_validate(content["error"])
+            message = JSONRPCErrorResponse(id=content.get("id"), error=error)
+            self.correlator.resolve(content.get("id"), message)
+
+        elif "method" in content:
+            if "id" in content: # Request
+                message = JSONRPCRequest.model_validate(content)
+                self.spawn(self.serve_request(message))
+            else: # Notification
+                message = JSONRPCNotification.model_validate(content)
+                await self.handle_notification(message)
+
+    async def serve_request(self, request: JSONRPCRequest) -> None:
+        """
+        Run `handle_request` under the concurrency limit and send back its
+        response, or an error response if the handler raised.
+        """
+        async with self.request_semaphore:
+            try:
+                response = await self.handle_request(request)
+            except MCPError as e:
+                response = JSONRPCErrorResponse(id=request.id, error=Error(code=e.code, message=e.message))
+            except Exception as e:
+                logger.error(f"Error handling {request.method} request: {e}", exc_info=True)
+                response = JSONRPCErrorResponse(id=request.id, error=Error(code=-32603, message=str(e)))
+        try:
+            await self.send_response(response)
+        except Exception as e:
+            logger.error(f"Error sending response to {request.method} request: {e}", exc_info=True)
+
+    def cancel_inflight(self) -> None:
+        """
+        Cancel pending requests and running server-initiated request handlers.
+        """
+        self.correlator.cancel_all()
+        for task in self.request_tasks:
+            task.cancel()
+        self.request_tasks.clear()
+
+    def fail_request(self, request_id: RequestId, message: str, code: int = -1) -> bool:
+        """
+        Resolve a pending request with a client-side error.
+
+        Returns:
+            True if the request was still pending.
+        """
+        error = Error(code=code, message=message)
+        return self.correlator.resolve(request_id, JSONRPCErrorResponse(id=request_id, error=error))
+
+    def connection_lost(self, reason: str) -> None:
+        """
+        Report that the connection ended unexpectedly. Pending requests raise
+        `ConnectionLost` and `on_connection_lost` is called with the reason.
+        """
+        logger.warning(f"Connection lost: {reason}")
+        self.correlator.fail_all(ConnectionLost(reason))
+        if self.on_connection_lost is not None:
+            self.on_connection_lost(reason)
+
+    def reject_oversized(self, message: OversizedMessage) -> None:
+        """
+        Fail the request whose response was dropped for exceeding the message size limit.
+        """
+        request_id = message.request_id()
+        reason = f"Response too large: at least {message.size} bytes exceeds the maximum message size"
+        if request_id is None or not self.fail_request(request_id, reason):
+            logger.error(f"Dropped oversized message ({message.size} bytes) with no matching request")
 
     async def handle_request(self, request: JSONRPCMessage) -> JSONRPCResponse | None:
         """
@@ -73,7 +420,7 @@ class BaseTransport(ABC):
         from src.mcp.types.common import RequestParams
         from src.mcp.types.json_rpc import Method
         from pydantic import TypeAdapter
-        
+
         match request.method:
             case Method.SAMPLING_CREATE_MESSAGE:
                 params=TypeAdapter(CreateMessageRequestParams).validate_python(request.params)
@@ -81,43 +428,52 @@ class BaseTransport(ABC):
                 if sampling_callback is None:
                     raise Exception("Sampling callback not found")
                 result=await sampling_callback(params=params)
-                return JSONRPCResponse(id=request.id,result=result.model_dump(by_alias=True, exclude_none=True))
-            
+                return JSONRPCResultResponse(id=request.id,result=result.model_dump(by_alias=True, exclude_none=True))
+
             case Method.ELICITATION_CREATE:
                 params=TypeAdapter(ElicitRequestParams).validate_python(request.params)
                 elicitation_callback = self.callbacks.get("elicitation")
                 if elicitation_callback is None:
                     raise Exception("Elicitation callback not found")
                 result=await elicitation_callback(params=params)
-                return JSONRPCResponse(id=request.id,result=result.model_dump(by_alias=True, exclude_none=True))
-            
+                return JSONRPCResultResponse(id=request.id,result=result.model_dump(by_alias=True, exclude_none=True))
+
             case Method.ROOTS_LIST:
                 params = TypeAdapter(RequestParams).validate_python(request.params) if request.params else None
                 list_roots_callback = self.callbacks.get("list_roots")
                 if list_roots_callback is None:
                     raise Exception("List roots callback not found")
                 result=await list_roots_callback(params=params)
-                return JSONRPCResponse(id=request.id,result=result.model_dump(by_alias=True, exclude_none=True))
-            
+                return JSONRPCResultResponse(id=request.id,result=result.model_dump(by_alias=True, exclude_none=True))
+
             case _:
-                raise MCPError(code=-1, message=f"Unknown method: {request.method}")
+                raise MCPError(code=-32601, message=f"Unknown method: {request.method}")
 
     async def handle_notification(self, notification: JSONRPCMessage) -> None:
         """
         Handle a JSON-RPC notification from the MCP server.
         """
         from src.mcp.types.json_rpc import Method
-        from src.mcp.types.logging import LogMessageNotificationParams
-        
+        from src.mcp.types.logging import LoggingMessageNotificationParams
+
         match notification.method:
+            case Method.NOTIFICATION_PROGRESS:
+                params = ProgressNotificationParams.model_validate(notification.params)
+                handler = self.progress_handlers.get(self.correlator.normalize_id(params.progressToken))
+                if handler:
+                    await handler(params)
+
             case Method.NOTIFICATION_MESSAGE:
                  if notification.params:
-                    params = LogMessageNotificationParams.model_validate(notification.params)
+                    params = LoggingMessageNotificationParams.model_validate(notification.params)
                     logging_callback = self.callbacks.get("logging")
                     if logging_callback:
                         await logging_callback(params=params)
-            
+
+            case Method.NOTIFICATION_TOOLS_LIST_CHANGED | Method.NOTIFICATION_PROMPTS_LIST_CHANGED | Method.NOTIFICATION_RESOURCES_LIST_CHANGED:
+                if self.on_list_changed is not None:
+                    self.on_list_changed(notification.method)
+
             case _:
                 # Ignore unknown notifications
                 pass
-
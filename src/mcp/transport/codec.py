@@ -0,0 +1,98 @@
+from pydantic import BaseModel
+from typing import Any
+import json
+
+class JSONCodec:
+    """
+    Serializes JSON-RPC messages to and from bytes using the stdlib `json` module.
+
+    Pydantic models skip the intermediate `model_dump` dict and are serialized
+    straight to bytes by pydantic-core, whichever backend is used for plain data.
+    A list of messages is encoded as a JSON-RPC batch array.
+    Decoding invalid input raises `ValueError` for every codec.
+    """
+    name = "json"
+
+    def encode(self, message: BaseModel | list | Any) -> bytes:
+        if isinstance(message, BaseModel):
+            return message.__pydantic_serializer__.to_json(message, by_alias=True)
+        if isinstance(message, list):
+            return b"[" + b",".join(self.encode(item) for item in message) + b"]"
+        return self.dumps(message)
+
+    def decode(self, data: bytes | str) -> Any:
+        return self.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    def loads(self, data: bytes | str) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    """
+    JSON codec backed by `orjson` (optional dependency).
+    """
+    name = "orjson"
+
+    def __init__(self) -> None:
+        import orjson
+        self._orjson = orjson
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._orjson.dumps(obj)
+
+    def loads(self, data: bytes | str) -> Any:
+        return self._orjson.loads(data)
+
+
+class MsgspecCodec(JSONCodec):
+    """
+    JSON codec backed by `msgspec` (optional dependency).
+    """
+    name = "msgspec"
+
+    def __init__(self) -> None:
+        import msgspec
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+        self._decode_error = msgspec.DecodeError
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj)
+
+    def loads(self, data: bytes | str) -> Any:
+        try:
+            return self._decoder.decode(data)
+        except self._decode_error as e:
+            # Keep the `ValueError` contract of the other codecs
+            raise ValueError(str(e)) from e
+
+
+CODECS: dict[str, type[JSONCodec]] = {
+    JSONCodec.name: JSONCodec,
+    OrjsonCodec.name: OrjsonCodec,
+    MsgspecCodec.name: MsgspecCodec,
+}
+
+def get_codec(codec: str | JSONCodec | None = None) -> JSONCodec:
+    '''
+    Resolve a codec from its name
+
+    Args:
+        codec: A codec instance, a codec name ("json", "orjson", "msgspec") or None for stdlib json
+
+    Returns:
+        The codec instance
+    '''
+    if isinstance(codec, JSONCodec):
+        return codec
+    if codec is None:
+        return JSONCodec()
+    if codec not in CODECS:
+        raise ValueError(f'Unknown codec: {codec}. Available codecs: {", ".join(CODECS)}')
+    try:
+        return CODECS[codec]()
+    except ImportError as e:
+        raise ImportError(f'Codec "{codec}" requires the {codec} package to be installed') from e
@@ -0,0 +1,101 @@
+from dataclasses import dataclass
+from typing import Any
+import re
+
+DEFAULT_MAX_MESSAGE_SIZE = 64 * 1024 * 1024
+
+_HEAD_SIZE = 4096
+_ID_PATTERN = re.compile(rb'"id"\s*:\s*(-?\d+|"(?:[^"\\]|\\.)*")')
+
+@dataclass
+class OversizedMessage:
+    """
+    A message that exceeded the framer's size limit and was dropped.
+
+    `head` holds the first bytes of the message, enough to recover the
+    JSON-RPC id of the response in most cases.
+    """
+    head: bytes
+    size: int
+
+    def request_id(self) -> Any:
+        '''
+        Best-effort extraction of the JSON-RPC id from the message head
+
+        Returns:
+            The id, or None if it could not be found before the result/error member
+        '''
+        end = len(self.head)
+        for key in (b'"result"', b'"error"'):
+            index = self.head.find(key)
+            if index != -1:
+                end = min(end, index)
+        match = _ID_PATTERN.search(self.head, 0, end)
+        if match is None:
+            return None
+        value = match.group(1)
+        if value.startswith(b'"'):
+            return value[1:-1].decode(errors="replace")
+        return int(value)
+
+
+class LineFramer:
+    """
+    Splits a byte stream into newline-delimited messages.
+
+    Data is accumulated in a single growable buffer and only the newly fed
+    bytes are scanned for a delimiter, so a message arriving in many chunks is
+    scanned once. A message larger than `max_message_size` is reported as an
+    `OversizedMessage` as soon as the limit is crossed, and the rest of it is
+    discarded up to the next newline without being buffered.
+    """
+
+    def __init__(self, max_message_size: int = DEFAULT_MAX_MESSAGE_SIZE) -> None:
+        self.max_message_size = max_message_size
+        self._buffer = bytearray()
+        self._scanned = 0
+        self._discarding = False
+
+    def feed(self, data: bytes) -> list[bytes | OversizedMessage]:
+        '''
+        Add bytes from the stream and return the messages completed by them
+
+        Args:
+            data: The received bytes
+
+        Returns:
+            Complete messages without their delimiter, and OversizedMessage markers
+        '''
+        messages: list[bytes | OversizedMessage] = []
+        offset = 0
+        if self._discarding:
+            index = data.find(b"\n")
+            if index == -1:
+                return messages
+            self._discarding = False
+            offset = index + 1
+
+        self._buffer += memoryview(data)[offset:]
+        start = 0
+        while (index := self._buffer.find(b"\n", self._scanned)) != -1:
+            if index - start <= self.max_message_size:
+                line = bytes(memoryview(self._buffer)[start:index])
+                if line.strip():
+                    messages.append(line)
+            else:
+                messages.append(OversizedMessage(head=bytes(self._buffer[start:min(index, start + _HEAD_SIZE)]), size=index - start))
+            start = self._scanned = index + 1
+        if start:
+            del self._buffer[:start]
+        self._scanned = len(self._buffer)
+
+        if len(self._buffer) > self.max_message_size:
+            messages.append(OversizedMessage(head=bytes(self._buffer[:_HEAD_SIZE]), size=len(self._buffer)))
+            self._buffer.clear()
+            self._scanned = 0
+            self._discarding = True
+        return messages
+
+    def pending(self) -> int:
+        """Number of buffered bytes of the incomplete message."""
+        return len(self._buffer)
@@ -0,0 +1,142 @@
+from src.mcp.logger import get_logger
+from httpx import AsyncClient, Limits, URL
+from dataclasses import dataclass
+from typing import Any, Optional
+import asyncio
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class PoolLimits:
+    """
+    Connection pool settings of an HTTP server.
+
+    `http2` multiplexes requests over a single connection per host and needs
+    the optional `h2` package; without it the pool falls back to HTTP/1.1.
+    """
+    max_connections: int = 10
+    max_keepalive_connections: Optional[int] = None
+    keepalive_expiry: float = 5.0
+    http2: bool = False
+
+    @classmethod
+    def from_config(cls, server_config: dict[str, Any]) -> 'PoolLimits':
+        return cls(
+            max_connections=server_config.get('max_connections', cls.max_connections),
+            max_keepalive_connections=server_config.get('max_keepalive_connections', cls.max_keepalive_connections),
+            keepalive_expiry=server_config.get('keepalive_expiry', cls.keepalive_expiry),
+            http2=server_config.get('http2', cls.http2),
+        )
+
+
+def http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class HTTPClientPool:
+    """
+    `httpx.AsyncClient` instances shared by every transport talking to the same host.
+
+    Clients are keyed by origin and pool limits, and reference counted: the
+    first `acquire` creates the client, the last `release` closes it. Clients
+    carry no headers or timeouts of their own, transports pass them per request.
+    """
+
+    def __init__(self) -> None:
+        self.clients: dict[tuple, AsyncClient] = {}
+        self.refcounts: dict[tuple, int] = {}
+        self.lock = asyncio.Lock()
+
+    def get_key(self, url: str, limits: PoolLimits) -> tuple:
+        origin = URL(url)
+        return (origin.scheme, origin.host, origin.port, limits)
+
+    def create_client(self, limits: PoolLimits) -> AsyncClient:
+        http2 = limits.http2
+        if http2 and not http2_available():
+            logger.warning("HTTP/2 requires the h2 package, falling back to HTTP/1.1")
+            http2 = False
+        return AsyncClient(
+            http2=http2,
+            limits=Limits(
+                max_connections=limits.max_connections,
+                max_keepalive_connections=limits.max_keepalive_connections,
+                keepalive_expiry=limits.keepalive_expiry,
+            ),
+        )
+
+    async def acquire(self, url: str, limits: Optional[PoolLimits] = None) -> AsyncClient:
+        '''
+        Get the shared client for the host of a URL
+
+        Args:
+            url: The server URL
+            limits: Pool settings, servers with different settings get separate clients
+
+        Returns:
+            The shared client, to be handed back with `release`
+        '''
+        key = self.get_key(url, limits or PoolLimits())
+        async with self.lock:
+            if key not in self.clients:
+                self.clients[key] = self.create_client(key[-1])
+                self.refcounts[key] = 0
+            self.refcounts[key] += 1
+            return self.clients[key]
+
+    async def release(self, client: AsyncClient) -> None:
+        '''
+        Hand back a client obtained from `acquire`, closing it when no transport uses it anymore
+
+        Args:
+            client: The client to release
+        '''
+        async with self.lock:
+            key = next((key for key, value in self.clients.items() if value is client), None)
+            if key is None:
+                return
+            self.refcounts[key] -= 1
+            if self.refcounts[key] > 0:
+                return
+            del self.clients[key]
+            del self.refcounts[key]
+        await client.aclose()
+
+    async def preconnect(self, url: str, limits: Optional[PoolLimits] = None, timeout: float = 5) -> None:
+        '''
+        Open a connection to the host of a URL ahead of the first request
+
+        The connection is established with a HEAD request and stays in the
+        pool's keep-alive set, so the first call skips the TCP and TLS handshake.
+        The client is not kept alive by this call alone. The URL must answer
+        HEAD with a complete response; event stream URLs are not suitable.
+
+        Args:
+            url: The server URL
+            limits: Pool settings of the server
+            timeout: Time allowed for the handshake
+        '''
+        client = await self.acquire(url, limits)
+        try:
+            await client.head(url, timeout=timeout)
+        except Exception as e:
+            logger.debug(f"Preconnect to {url} failed: {e}")
+        finally:
+            # Keep the client (and its warm connection) for the transport about to acquire it
+            async with self.lock:
+                key = self.get_key(url, limits or PoolLimits())
+                if key in self.refcounts:
+                    self.refcounts[key] -= 1
+
+    async def aclose(self) -> None:
+        """Close every client, whether released or not."""
+        async with self.lock:
+            clients = list(self.clients.values())
+            self.clients.clear()
+            self.refcounts.clear()
+        await asyncio.gather(*(client.aclose() for client in clients), return_exceptions=True)
@@ -0,0 +1,316 @@
+from src.mcp.types.json_rpc import JSONRPCMessage, JSONRPCResponse, Method
+from src.mcp.types.notification import InitializedNotification, ProgressFn
+from src.mcp.types.common import RequestId
+from src.mcp.transport.base import BaseTransport, current_batch
+from src.mcp.exception import MCPError, ConnectionLost
+from src.mcp.logger import get_logger
+from contextlib import contextmanager
+from contextvars import ContextVar
+from itertools import count
+from typing import Callable, Iterator, Optional
+import asyncio
+
+logger = get_logger(__name__)
+
+current_affinity: ContextVar[Optional[str]] = ContextVar("current_affinity", default=None)
+
+@contextmanager
+def affinity(key: str) -> Iterator[None]:
+    '''
+    Route the requests made inside the block to the same member of a pooled transport
+
+    Requests sharing a key always reach the same replica while it is alive,
+    so state the server keeps between calls (a login, an open document) is
+    found again. Without a pooled transport the key has no effect.
+
+    Args:
+        key: Any string identifying the state, e.g. a user or conversation id
+    '''
+    token = current_affinity.set(key)
+    try:
+        yield
+    finally:
+        current_affinity.reset(token)
+
+
+class PooledTransport(BaseTransport):
+    """
+    One logical connection backed by several member transports, e.g. replicas
+    of a stdio server.
+
+    Each request goes to the live member with the fewest requests in flight.
+    `initialize` and notifications go to every member, and so does
+    `logging/setLevel`. Resource subscriptions go to the first live member,
+    which then sends the updates. Requests made under `affinity(key)` stick
+    to one member.
+
+    A member whose connection is lost is replaced by a fresh one from
+    `factory`, initialized with the session's original initialize request.
+    Requests in flight on it raise a partial `ConnectionLost`, which the
+    session may replay on another member. While the last member is being
+    replaced, requests wait for the replacement. The pooled connection is
+    only reported lost when no member can be replaced.
+    """
+
+    BROADCAST_METHODS = frozenset({Method.LOGGING_SET_LEVEL})
+    PRIMARY_METHODS = frozenset({Method.RESOURCES_SUBSCRIBE, Method.RESOURCES_UNSUBSCRIBE})
+
+    def __init__(self, factory: Callable[[int], BaseTransport], size: int, replace_attempts: int = 5, replace_delay: float = 0.5, **kwargs):
+        super().__init__(**kwargs)
+        self.factory = factory
+        self.size = size
+        self.replace_attempts = replace_attempts
+        self.replace_delay = replace_delay
+        self.members: list[Optional[BaseTransport]] = []
+        self.affinity_map: dict[str, int] = {}
+        self.replacing: set[int] = set()
+        self.members_changed = asyncio.Event()
+        self.initialize_request: Optional[JSONRPCMessage] = None
+        self.initialized = False
+        self.closing = False
+        self._rotation = count()
+
+    @property
+    def pending(self) -> dict[RequestId, asyncio.Future]:
+        pending = {}
+        for member in self.live_members():
+            pending.update(member.pending)
+        return pending
+
+    def live_members(self) -> list[BaseTransport]:
+        return [member for member in self.members if member is not None]
+
+    async def wait_for_member(self, timeout: Optional[float] = None) -> None:
+        '''
+        Wait while no member is live but one is being replaced
+
+        Args:
+            timeout: Seconds to wait at most, or None until the replacements succeed or give up
+
+        Raises:
+            ConnectionLost: If no member is live afterwards; partial while replacements are still going on
+        '''
+        try:
+            async with asyncio.timeout(timeout):
+                while not self.live_members() and self.replacing and not self.closing:
+                    await self.members_changed.wait()
+        except TimeoutError:
+            pass
+        if not self.live_members():
+            raise ConnectionLost("No live members in the pool", partial=bool(self.replacing) and not self.closing)
+
+    def notify_members_changed(self) -> None:
+        # Wake every waiter, then start over for the next change
+        event, self.members_changed = self.members_changed, asyncio.Event()
+        event.set()
+
+    def attach_callbacks(self, callbacks: dict[str, Callable]):
+        self.callbacks = callbacks
+        for member in self.live_members():
+            member.attach_callbacks(callbacks)
+
+    def get_stderr(self) -> list[str]:
+        lines = []
+        for index, member in enumerate(self.members):
+            if member is not None:
+                lines.extend(f"[{index}] {line}" for line in member.get_stderr())
+        return lines
+
+    def create_member(self, index: int) -> BaseTransport:
+        member = self.factory(index)
+        member.attach_callbacks(self.callbacks)
+        member.on_connection_lost = lambda reason: self.member_lost(index, member, reason)
+        member.on_list_changed = self.forward_list_changed
+        return member
+
+    def forward_list_changed(self, method: str) -> None:
+        if self.on_list_changed is not None:
+            self.on_list_changed(method)
+
+    async def connect(self) -> None:
+        """Create and connect every member."""
+        self.closing = False
+        self.initialized = False
+        self.initialize_request = None
+        self.members = [self.create_member(index) for index in range(self.size)]
+        results = await asyncio.gather(*(member.connect() for member in self.members), return_exceptions=True)
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            await self.disconnect()
+            raise errors[0]
+
+    async def disconnect(self) -> None:
+        """Disconnect every member."""
+        self.closing = True
+        self.cancel_inflight()
+        members, self.members = self.live_members(), []
+        self.affinity_map.clear()
+        self.replacing.clear()
+        self.notify_members_changed()
+        await asyncio.gather(*(member.disconnect() for member in members), return_exceptions=True)
+
+    async def send_message(self, message: JSONRPCMessage) -> None:
+        """Send a notification to every member."""
+        if not self.members:
+            raise MCPError(code=-1, message="Pooled transport not connected")
+        if getattr(message, "method", None) == Method.NOTIFICATION_INITIALIZED:
+            self.initialized = True
+        await asyncio.gather(*(member.send_message(message) for member in self.live_members()))
+
+    async def send_batch(self, messages: list[JSONRPCMessage]) -> None:
+        # Batched requests were already routed to their members one by one
+        pass
+
+    def choose(self, candidates: list[int]) -> int:
+        '''
+        Pick the member for a request
+
+        Args:
+            candidates: Indexes of the live members
+
+        Returns:
+            The index of the member with the fewest requests in flight, ties broken in rotation
+        '''
+        offset = next(self._rotation) % len(candidates)
+        rotated = candidates[offset:] + candidates[:offset]
+        return min(rotated, key=lambda index: len(self.members[index].pending))
+
+    def route(self, request: JSONRPCMessage) -> int:
+        candidates = [index for index, member in enumerate(self.members) if member is not None]
+        if not candidates:
+            raise ConnectionLost("No live members in the pool", partial=bool(self.replacing))
+        if request.method in self.PRIMARY_METHODS:
+            return candidates[0]
+        key = current_affinity.get()
+        if key is None:
+            return self.choose(candidates)
+        index = self.affinity_map.get(key)
+        if index is None or self.members[index] is None:
+            index = self.affinity_map[key] = self.choose(candidates)
+        return index
+
+    async def send_request(
+        self,
+        request: JSONRPCMessage,
+        timeout: Optional[float] = None,
+        on_progress: Optional[ProgressFn] = None,
+        reset_timeout_on_progress: Optional[bool] = None,
+    ) -> JSONRPCResponse | None:
+        """
+        Send a request to the member chosen by the routing rules and wait for its response.
+        """
+        batch = current_batch.get()
+        if batch is not None and batch.transport is self:
+            # Members send directly; recording the request lets the batch know it went out
+            batch.add(request)
+            current_batch.set(None)
+
+        if not self.live_members():
+            await self.wait_for_member(timeout)
+
+        if request.method == Method.INITIALIZE:
+            self.initialize_request = request
+            return await self.broadcast_request(request, timeout)
+        if request.method in self.BROADCAST_METHODS:
+            return await self.broadcast_request(request, timeout)
+
+        index = self.route(request)
+        try:
+            return await self.send_to(index, request, timeout, on_progress, reset_timeout_on_progress)
+        except ConnectionLost as e:
+            raise ConnectionLost(f"Member {index} lost: {e.message}", partial=bool(self.live_members() or self.replacing)) from e
+
+    async def send_to(
+        self,
+        index: int,
+        request: JSONRPCMessage,
+        timeout: Optional[float] = None,
+        on_progress: Optional[ProgressFn] = None,
+        reset_timeout_on_progress: Optional[bool] = None,
+    ) -> JSONRPCResponse | None:
+        """
+        Send a routed request through one member.
+        """
+        return await self.members[index].send_request(request, timeout=timeout, on_progress=on_progress, reset_timeout_on_progress=reset_timeout_on_progress)
+
+    async def broadcast_request(self, request: JSONRPCMessage, timeout: Optional[float] = None) -> JSONRPCResponse | None:
+        '''
+        Send a request to every live member
+
+        Args:
+            request: The request
+            timeout: Seconds to wait for each response
+
+        Returns:
+            The response of the first member; every member must succeed
+        '''
+        members = self.live_members()
+        if not members:
+            raise ConnectionLost("No live members in the pool", partial=bool(self.replacing))
+        responses = await asyncio.gather(*(member.send_request(request, timeout=timeout) for member in members))
+        return responses[0]
+
+    def member_lost(self, index: int, member: BaseTransport, reason: str) -> None:
+        if self.closing or index >= len(self.members) or self.members[index] is not member:
+            return
+        logger.warning(f"Pool member {index} lost: {reason}")
+        self.members[index] = None
+        self.replacing.add(index)
+        self.spawn(self.replace(index, member))
+
+    async def start_member(self, index: int) -> BaseTransport:
+        '''
+        Connect a new member and bring it to the state of the others
+
+        Args:
+            index: Position of the member in the pool
+
+        Returns:
+            The connected member, initialized if the pool was
+        '''
+        member = self.create_member(index)
+        try:
+            await member.connect()
+            if self.initialize_request is not None:
+                await member.send_request(self.initialize_request)
+            if self.initialized:
+                await member.send_notification(InitializedNotification())
+        except BaseException:
+            await member.disconnect()
+            raise
+        return member
+
+    async def replace(self, index: int, member: BaseTransport) -> None:
+        '''
+        Replace a lost member with a new, initialized one
+
+        Args:
+            index: Position of the member in the pool
+            member: The lost member, disconnected first
+        '''
+        try:
+            await member.disconnect()
+        except Exception as e:
+            logger.warning(f"Error disconnecting pool member {index}: {e}")
+        try:
+            for attempt in range(self.replace_attempts):
+                if attempt:
+                    await asyncio.sleep(self.replace_delay * 2 ** (attempt - 1))
+                if self.closing:
+                    return
+                try:
+                    replacement = await self.start_member(index)
+                except Exception as e:
+                    logger.warning(f"Replacing pool member {index} failed (attempt {attempt + 1}): {e}")
+                    continue
+                if self.closing:
+                    await replacement.disconnect()
+                    return
+                self.members[index] = replacement
+                logger.info(f"Pool member {index} replaced")
+                return
+        finally:
+            self.replacing.discard(index)
+            self.notify_members_changed()
+        if not self.live_members() and not self.replacing and not self.closing:
+            self.connection_lost(f"All {self.size} pool members lost")
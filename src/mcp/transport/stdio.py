@@ -1,22 +1,15 @@
-from src.mcp.types.json_rpc import (
-    JSONRPCRequest,
-    JSONRPCResponse,
-    JSONRPCResultResponse,
-    JSONRPCErrorResponse,
-    JSONRPCError,
-    JSONRPCNotification,
-    JSONRPCMessage,
-    Error, Method
-)
+from src.mcp.types.json_rpc import JSONRPCMessage
 from src.mcp.transport.utils import get_default_environment
 from src.mcp.logger import get_logger
 
 from src.mcp.types.stdio import StdioServerParams
 from src.mcp.transport.base import BaseTransport
-from src.mcp.exception import MCPError
+from src.mcp.transport.framing import LineFramer, OversizedMessage, DEFAULT_MAX_MESSAGE_SIZE
+from src.mcp.transport.writer import MessageWriter
+from src.mcp.exception import MCPError, ConnectionLost
 from asyncio.subprocess import Process
+from collections import deque
 import asyncio
-import json
 import sys
 
 logger = get_logger(__name__)
@@ -25,13 +18,35 @@ logger = get_logger(__name__)
 class StdioTransport(BaseTransport):
     """
     Stdio Transport for MCP
+
+    Messages on stdout are newline-delimited and framed by `LineFramer`, so their
+    size is bounded by `max_message_size` rather than the StreamReader limit.
+    The server's stderr is drained continuously so a chatty server never blocks
+    on a full pipe. The last `stderr_lines` lines are kept in a ring buffer for
+    diagnostics and are optionally forwarded to the logger.
+
+    Messages for stdin are written at once while the pipe keeps up. Once its
+    buffer passes the high-water mark they go through a single writer task:
+    everything queued since the previous write is flushed with one write and
+    one drain. At most `write_queue_size` messages wait in the queue, so
+    senders are throttled while the server is slow to read.
     """
 
-    def __init__(self, params: StdioServerParams):
+    STDOUT_CHUNK_SIZE = 256 * 1024
+    STDERR_CHUNK_SIZE = 64 * 1024
+    STDERR_MAX_LINE = 64 * 1024
+
+    def __init__(self, params: StdioServerParams, stderr_lines: int = 1000, forward_stderr: bool = False, max_message_size: int = DEFAULT_MAX_MESSAGE_SIZE, write_queue_size: int = 1024, **kwargs):
+        super().__init__(**kwargs)
         self.params = params
+        self.max_message_size = max_message_size
+        self.write_queue_size = write_queue_size
+        self.writer: MessageWriter | None = None
         self.process: Process | None = None
         self.listen_task: asyncio.Task | None = None
-        self.pending: dict[str | int, asyncio.Future] = {}
+        self.stderr_task: asyncio.Task | None = None
+        self.stderr_buffer: deque[str] = deque(maxlen=stderr_lines)
+        self.forward_stderr = forward_stderr
 
     async def connect(self) -> None:
         """Create a subprocess and start the listener."""
@@ -56,108 +71,119 @@ class StdioTransport(BaseTransport):
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
             start_new_session=True,
+            limit=self.STDOUT_CHUNK_SIZE,
         )
 
         self.listen_task = asyncio.create_task(self.listen())
+        self.stderr_task = asyncio.create_task(self.drain_stderr())
+        self.writer = MessageWriter(self.write_lines, self.on_write_error, self.write_queue_size, write_now=self.write_line)
+        self.writer.start()
+
+    def get_stderr(self) -> list[str]:
+        """Return the most recent stderr lines of the server process."""
+        return list(self.stderr_buffer)
+
+    def _record_stderr(self, line: bytes) -> None:
+        text = line.decode(errors="replace").rstrip("\r")
+        self.stderr_buffer.append(text)
+        if self.forward_stderr:
+            logger.info(f"[{self.params.command}] {text}")
 
-    async def send_request(self, request: JSONRPCMessage) -> JSONRPCResponse:
+    async def drain_stderr(self):
+        """
+        Read the subprocess stderr until EOF, keeping the last lines in the ring buffer.
+        """
+        buffer = bytearray()
+        try:
+            while True:
+                chunk = await self.process.stderr.read(self.STDERR_CHUNK_SIZE)
+                if not chunk:
+                    break
+                buffer.extend(chunk)
+                *lines, rest = buffer.split(b"\n")
+                for line in lines:
+                    self._record_stderr(line)
+                buffer = bytearray(rest)
+                # Overlong lines are cut so a newline-free stream cannot grow unbounded
+                while len(buffer) > self.STDERR_MAX_LINE:
+                    self._record_stderr(buffer[:self.STDERR_MAX_LINE])
+                    del buffer[:self.STDERR_MAX_LINE]
+            if buffer:
+                self._record_stderr(buffer)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Error reading process stderr: {e}", exc_info=True)
+
+    async def send_message(self, message: JSONRPCMessage) -> None:
         """
-        Send a JSON-RPC request to the MCP server and await response.
+        Queue a newline-delimited JSON-RPC message for the subprocess stdin.
         """
-        if not self.process or not self.process.stdin:
+        if not self.process or not self.process.stdin or self.writer is None:
             raise MCPError(code=-1, message="Process not connected")
 
-        future = asyncio.get_event_loop().create_future()
-        self.pending[request.id] = future
-
-        # Send request
         if self.process.stdin.is_closing():
-            raise MCPError(code=-1, message="Process stdin is closing")
-        self.process.stdin.write((json.dumps(request.model_dump(by_alias=True)) + "\n").encode())
-        await self.process.stdin.drain()
+            raise ConnectionLost("Process stdin is closing")
 
-        try:
-            response = await asyncio.wait_for(future, timeout=30)
-        except asyncio.TimeoutError:
-            self.pending.pop(request.id, None)
-            raise MCPError(code=-1, message="Request timed out")
-
-        if isinstance(response, JSONRPCErrorResponse):
-            raise MCPError(code=response.error.code, message=response.error.message)
-
-        return response
-    
-    async def send_response(self, response: JSONRPCResponse):
-        if not self.process or not self.process.stdin:
-            raise MCPError(code=-1, message="Process not connected")
-        
-        if self.process.stdin.is_closing():
-             raise MCPError(code=-1, message="Process stdin is closing")
+        await self.writer.put(self.codec.encode(message) + b"\n")
 
-        self.process.stdin.write((json.dumps(response.model_dump(by_alias=True)) + "\n").encode())
-        await self.process.stdin.drain()
-    
-    async def send_notification(self, notification: JSONRPCMessage) -> None:
-        """
-        Send a JSON-RPC notification (fire-and-forget).
-        """
-        if not self.process or not self.process.stdin:
-            raise MCPError(code=-1, message="Process not connected")
+    def write_line(self, data: bytes) -> bool:
+        transport = self.process.stdin.transport
+        # Past the high-water mark the message has to wait for a drain
+        if transport.get_write_buffer_size() > transport.get_write_buffer_limits()[1]:
+            return False
+        self.process.stdin.write(data)
+        return True
 
-        self.process.stdin.write((json.dumps(notification.model_dump(by_alias=True)) + "\n").encode())
+    async def write_lines(self, batch: list[bytes]) -> None:
+        self.process.stdin.write(b"".join(batch))
         await self.process.stdin.drain()
 
+    def on_write_error(self, error: Exception) -> None:
+        # Requests still queued or awaiting a response can no longer complete
+        self.connection_lost(f"Error writing to process: {error}")
+
     async def listen(self):
         """
         Listen for responses from the subprocess (stdout).
         """
+        framer = LineFramer(max_message_size=self.max_message_size)
         while True:
             try:
-                line = await self.process.stdout.readline()
-                if not line:
+                chunk = await self.process.stdout.read(self.STDOUT_CHUNK_SIZE)
+                if not chunk:
                     break
-                
-                try:
-                    content: dict = json.loads(line.decode().strip())
-
-                    if "result" in content: # Response
-                        message = JSONRPCResultResponse.model_validate(content)
-                    elif "method" in content: # Request or Notification
-                        if "id" in content:
-                            message = JSONRPCRequest.model_validate(content)
-                            response = await self.handle_request(message)
-                            await self.send_response(response)
-                        else:
-                            message = JSONRPCNotification.model_validate(content)
-                            await self.handle_notification(message)
-                    elif "error" in content: # Error
-                        err = Error.model_validate(content["error"])
-                        message = JSONRPCErrorResponse(id=content.get("id"), error=err)
-                    else:
-                        continue
-
-                    msg_id = content.get("id")
-                    future = self.pending.pop(msg_id, None)
-                    if future and not future.done():
-                        future.set_result(message)
 
-                except json.JSONDecodeError:
-                    continue
+                for message in framer.feed(chunk):
+                    if isinstance(message, OversizedMessage):
+                        self.reject_oversized(message)
+                        continue
+                    try:
+                        content: dict = self.codec.decode(message)
+                    except ValueError:
+                        continue
+                    await self.dispatch(content)
             except asyncio.CancelledError:
-                break
+                return
             except Exception as e:
                 logger.error(f"Error reading from process: {e}", exc_info=True)
+        self.connection_lost("Server process closed its stdout")
 
     async def disconnect(self):
         """Gracefully disconnect and terminate the process."""
-        if self.listen_task:
-            self.listen_task.cancel()
-            try:
-                await self.listen_task
-            except asyncio.CancelledError:
-                pass
-            finally:
-                self.listen_task = None
+        for task in (self.listen_task, self.stderr_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self.listen_task = None
+        self.stderr_task = None
+
+        if self.writer:
+            await self.writer.stop()
+            self.writer = None
 
         if self.process:
             if self.process.stdin:
@@ -169,7 +195,8 @@ class StdioTransport(BaseTransport):
                 if hasattr(self.process.stdin, "wait_closed"):
                     await self.process.stdin.wait_closed()
 
-            self.process.terminate()
+            if self.process.returncode is None:
+                self.process.terminate()
             try:
                 await asyncio.wait_for(self.process.wait(), timeout=5)
             except asyncio.TimeoutError:
@@ -180,7 +207,4 @@ class StdioTransport(BaseTransport):
             self.process = None
 
         # Cancel pending futures
-        for fut in self.pending.values():
-            if not fut.done():
-                fut.cancel()
-        self.pending.clear()
+        self.cancel_inflight()
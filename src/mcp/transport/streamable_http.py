@@ -1,173 +1,247 @@
 from src.mcp.types.json_rpc import (
-    JSONRPCRequest,
-    JSONRPCNotification,
     JSONRPCResponse,
     JSONRPCResultResponse,
-    JSONRPCErrorResponse,
-    JSONRPCError,
     JSONRPCMessage,
-    Error,
     Method,
 )
 from src.mcp.transport.base import BaseTransport
-from src.mcp.exception import MCPError
+from src.mcp.transport.pool import HTTPClientPool, PoolLimits
+from src.mcp.types.common import RequestId
+from src.mcp.exception import MCPError, ConnectionLost, ServerFailure
 from src.mcp.logger import get_logger
-from httpx import AsyncClient, Limits
-from typing import Optional, Dict
+from httpx import AsyncClient, PoolTimeout, ReadTimeout, Response, Timeout, TransportError, WriteTimeout
+from httpx_sse import EventSource
+from contextvars import ContextVar
+from typing import Optional, Sequence
 import asyncio
-import json
+import random
 
 logger = get_logger(__name__)
 
+request_timeout: ContextVar[Optional[float]] = ContextVar("request_timeout", default=None)
+
 
 class StreamableHTTPTransport(BaseTransport):
     """
     HTTP transport supporting streaming JSON-RPC responses
     using asyncio.Future for one-shot request/response handling.
+
+    Each POST is answered in its own body, either a single `application/json`
+    message or a `text/event-stream` carrying notifications and finally the
+    response. The standalone GET stream for server-initiated messages is only
+    opened when `listen_stream` is set, once the session is initialized.
+
+    Event ids are tracked on every stream. When a stream drops before it is
+    done, the transport reconnects with `Last-Event-ID` using exponential
+    backoff (`reconnect_attempts`, `reconnect_delay`) and the server replays
+    the events it buffered, including a response produced in the meantime.
+
+    The HTTP client comes from `http_pool`, shared with other transports on
+    the same host; a private pool is used when none is given.
+
+    `http_timeout` bounds connecting and writing. A POST carrying a request
+    waits for its response as long as the request's own timeout; running
+    out of time fails that request only. Failing to reach the server, or a
+    session the server no longer knows, loses the connection.
     """
 
-    def __init__(self, url: str, headers: Optional[dict[str, str]] = None):
+    def __init__(self, url: str, headers: Optional[dict[str, str]] = None, http_timeout: float = 30, listen_stream: bool = False, reconnect_attempts: int = 5, reconnect_delay: float = 0.05, http_pool: Optional[HTTPClientPool] = None, pool_limits: Optional[PoolLimits] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.http_timeout = http_timeout
+        self.http_pool = http_pool or HTTPClientPool()
+        self.pool_limits = pool_limits or PoolLimits()
         self.url = url
         self.headers = headers or {}
+        self.listen_stream = listen_stream
+        self.reconnect_attempts = reconnect_attempts
+        self.reconnect_delay = reconnect_delay
         self.mcp_session_id = None
         self.protocol_version = None
         self.client: Optional[AsyncClient] = None
         self.listen_task: Optional[asyncio.Task] = None
-        self.pending: Dict[str, asyncio.Future] = {}
 
     async def connect(self):
-        """Create an HTTP client and start the listener."""
-        self.client = AsyncClient(
-            timeout=10,
-            headers=self.headers,
-            limits=Limits(max_connections=10),
-        )
-        self.listen_task = asyncio.create_task(self.listen())
-
-    async def send_response(self, response: JSONRPCResponse):
-        """Send a JSON-RPC response."""
-        if not self.client:
-             raise MCPError(code=-1, message="HTTP client not connected")
-        
+        """Acquire an HTTP client from the pool."""
+        self.client = await self.http_pool.acquire(self.url, self.pool_limits)
+
+    def get_headers(self, accept: str = "application/json, text/event-stream") -> dict[str, str]:
         headers = {
             **self.headers,
             "Content-Type": "application/json",
-            "Accept": "application/json, text/event-stream",
+            "Accept": accept,
         }
         if self.mcp_session_id:
             headers["mcp-session-id"] = self.mcp_session_id
+        if self.protocol_version:
+            headers["mcp-protocol-version"] = self.protocol_version
+        return headers
 
-        await self.client.post(self.url, headers=headers, json=response.model_dump(by_alias=True))
-
-    async def listen(self):
+    async def send_message(self, message: JSONRPCMessage | list[JSONRPCMessage]):
         """
-        Persistent stream listener for JSON-RPC responses.
-        Keeps connection open and dispatches responses to pending Futures.
+        POST a JSON-RPC message or batch to the MCP endpoint and handle the response body.
+
+        A JSON body is dispatched before returning; an event stream is consumed
+        in the background so notifications are delivered as they arrive.
         """
+        if not self.client:
+            raise MCPError(code=-1, message="HTTP client not connected")
+
+        read_timeout = request_timeout.get()
+        timeout = Timeout(self.http_timeout, read=read_timeout if read_timeout is not None else self.http_timeout)
+        request = self.client.build_request("POST", self.url, headers=self.get_headers(), content=self.codec.encode(message), timeout=timeout)
         try:
-            async with self.client.stream("GET", self.url, headers=self.headers) as response:
-                if self.mcp_session_id is None:
-                    self.mcp_session_id = response.headers.get("mcp-session-id")
-
-                buffer = bytearray()
-
-                async for chunk in response.aiter_bytes():
-                    buffer.extend(chunk)
-                    
-                    if b'\n' in buffer:
-                        parts = buffer.split(b'\n')
-                        buffer = parts.pop()
-                        
-                        for part in parts:
-                            if not part.strip():
-                                continue
-                            try:
-                                content = json.loads(part.decode(errors="ignore"))
-                            except json.JSONDecodeError:
-                                continue
-
-                            if "result" in content:
-                                msg_id = content.get("id")
-                                message = JSONRPCResultResponse.model_validate(content)
-                                if msg_id in self.pending:
-                                    fut = self.pending.pop(msg_id)
-                                    if not fut.done():
-                                        fut.set_result(message)
-
-                            elif "method" in content:
-                                message = JSONRPCRequest.model_validate(content)
-                                response = await self.handle_request(message)
-                                await self.send_response(response)
-
-                            elif "error" in content:
-                                msg_id = content.get("id")
-                                err = Error.model_validate(content["error"])
-                                message = JSONRPCErrorResponse(
-                                    id=msg_id,
-                                    error=err,
-                                )
-                                if msg_id in self.pending:
-                                    fut = self.pending.pop(msg_id)
-                                    if not fut.done():
-                                        fut.set_result(message)
+            response = await self.client.send(request, stream=True, follow_redirects=True)
+        except (ReadTimeout, WriteTimeout, PoolTimeout) as e:
+            # A slow response or a busy pool says nothing about the connection
+            raise MCPError(code=-1, message=f"Request timed out: {type(e).__name__}") from e
+        except TransportError as e:
+            self.connection_lost(f"HTTP request failed: {e}")
+            raise ConnectionLost(f"HTTP request failed: {e}") from e
+        try:
+            if response.status_code == 404 and self.mcp_session_id:
+                # The server no longer knows the session, e.g. after a restart
+                self.connection_lost("Session expired on the server")
+                raise ConnectionLost("Session expired on the server")
 
-        except Exception as e:
-            logger.error(f"Listen error: {e}", exc_info=True)
+            if session_id := response.headers.get("mcp-session-id"):
+                self.mcp_session_id = session_id
+
+            if response.status_code >= 400:
+                body = await response.aread()
+                message = f"HTTP {response.status_code}: {body.decode(errors='replace')}"
+                if response.status_code >= 500:
+                    raise ServerFailure(message)
+                raise MCPError(code=-1, message=message)
 
-    async def send_request(self, request: JSONRPCMessage) -> JSONRPCResponse:
+            content_type = response.headers.get("content-type", "")
+            if content_type.startswith("text/event-stream"):
+                messages = message if isinstance(message, list) else [message]
+                request_ids = [item.id for item in messages if getattr(item, "method", None) and getattr(item, "id", None) is not None]
+                self.spawn(self.consume_stream(response, request_ids=request_ids))
+                response = None
+            elif content_type.startswith("application/json"):
+                body = await response.aread()
+                if body.strip():
+                    await self.dispatch(self.codec.decode(body))
+        finally:
+            if response is not None:
+                await response.aclose()
+
+        if getattr(message, "method", None) == Method.NOTIFICATION_INITIALIZED and self.listen_stream and self.listen_task is None:
+            self.listen_task = asyncio.create_task(self.listen())
+
+    async def consume_stream(self, response: Response, request_ids: Sequence[RequestId] = ()) -> None:
         """
-        Send a JSON-RPC request and await its response via Future.
+        Dispatch every message of a server-sent event stream.
+
+        A stream answering `request_ids` is done once all their responses
+        arrived; the standalone stream (no `request_ids`) is never done. A
+        stream that ends or drops before it is done is resumed from its last
+        event id.
         """
-        if not self.client:
-            raise MCPError(code=-1, message="HTTP client not connected")
+        last_event_id: Optional[str] = None
+        retry_delay: Optional[float] = None
+        while True:
+            try:
+                async for event in EventSource(response).aiter_sse():
+                    if event.id:
+                        last_event_id = event.id
+                    if event.retry is not None:
+                        retry_delay = event.retry / 1000
+                    if event.event != "message" or not event.data:
+                        continue
+                    try:
+                        content = self.codec.decode(event.data)
+                    except ValueError:
+                        logger.warning(f"Invalid JSON in event stream: {event.data[:200]}")
+                        continue
+                    await self.dispatch(content)
+            except Exception as e:
+                logger.warning(f"Event stream interrupted: {e}")
+            finally:
+                await response.aclose()
 
-        future = asyncio.get_event_loop().create_future()
-        self.pending[request.id] = future
+            if request_ids:
+                request_ids = [request_id for request_id in request_ids if self.correlator.normalize_id(request_id) in self.pending]
+                if not request_ids:
+                    return
+                if last_event_id is None:
+                    for request_id in request_ids:
+                        self.fail_request(request_id, "Event stream closed before the response and the server does not support resumption")
+                    return
+            response = await self.reconnect(last_event_id, retry_delay)
+            if response is None:
+                for request_id in request_ids:
+                    self.fail_request(request_id, "Event stream lost and could not be resumed")
+                return
 
-        headers = {
-            **self.headers,
-            "Content-Type": "application/json",
-            "Accept": "application/json, text/event-stream",
-        }
+    async def reconnect(self, last_event_id: Optional[str], retry_delay: Optional[float] = None, backoff: bool = True) -> Optional[Response]:
+        '''
+        Reopen an event stream with a GET, resuming after `last_event_id` if given
 
-        if self.mcp_session_id:
-            headers["mcp-session-id"] = self.mcp_session_id
-        if self.protocol_version:
-            headers["mcp-protocol-version"] = self.protocol_version
+        Args:
+            last_event_id: Id of the last event received on the dropped stream
+            retry_delay: Delay suggested by the server through the SSE `retry` field
+            backoff: Wait before the first attempt too, as when replacing a dropped stream
 
-        await self.client.post(self.url, headers=headers, json=request.model_dump(by_alias=True))
+        Returns:
+            The new event stream response, or None if the server refused or all attempts failed
+        '''
+        headers = self.get_headers(accept="text/event-stream")
+        if last_event_id is not None:
+            headers["Last-Event-ID"] = last_event_id
+        for attempt in range(self.reconnect_attempts):
+            if attempt or backoff:
+                delay = max(retry_delay or 0, self.reconnect_delay * 2 ** attempt)
+                await asyncio.sleep(delay * random.uniform(1.0, 1.5))
+            if not self.client:
+                return None
+            try:
+                # The stream stays idle between messages, so only connecting is bounded
+                request = self.client.build_request("GET", self.url, headers=headers, timeout=Timeout(self.http_timeout, read=None))
+                response = await self.client.send(request, stream=True, follow_redirects=True)
+            except Exception as e:
+                logger.warning(f"Reconnect attempt {attempt + 1} failed: {e}")
+                continue
+            if response.status_code == 200 and response.headers.get("content-type", "").startswith("text/event-stream"):
+                return response
+            await response.aclose()
+            if response.status_code in (404, 405):
+                logger.info(f"Server refused event stream: HTTP {response.status_code}")
+                return None
+            logger.warning(f"Reconnect attempt {attempt + 1} failed: HTTP {response.status_code}")
+        return None
 
+    async def listen(self):
+        """
+        Standalone GET stream for requests and notifications initiated by the server.
+        """
         try:
-            response = await asyncio.wait_for(future, timeout=30)
-        except asyncio.TimeoutError:
-            self.pending.pop(request.id, None)
-            raise MCPError(code=-1, message="Request timed out")
+            response = await self.reconnect(last_event_id=None, backoff=False)
+            if response is not None:
+                await self.consume_stream(response)
+        except Exception as e:
+            logger.error(f"Listen error: {e}", exc_info=True)
 
-        if isinstance(response, JSONRPCErrorResponse):
-            raise MCPError(code=response.error.code, message=response.error.message)
+    async def send_request(self, request: JSONRPCMessage, **kwargs) -> JSONRPCResponse:
+        """
+        Send a JSON-RPC request and await its response via Future.
+        """
+        timeout = kwargs.get("timeout")
+        if timeout is None:
+            timeout = self.method_timeouts.get(request.method, self.timeout)
+        token = request_timeout.set(timeout)
+        try:
+            response = await super().send_request(request, **kwargs)
+        finally:
+            request_timeout.reset(token)
 
         # If initialize method, capture protocol version
-        if request.method == Method.INITIALIZE and isinstance(response, JSONRPCResponse):
+        if request.method == Method.INITIALIZE and isinstance(response, JSONRPCResultResponse):
             self.protocol_version = response.result.get("protocolVersion")
 
         return response
 
-    async def send_notification(self, notification: JSONRPCMessage):
-        """Send a fire-and-forget notification."""
-        if not self.client:
-            raise MCPError(code=-1, message="HTTP client not connected")
-
-        headers = {
-            **self.headers,
-            "Content-Type": "application/json",
-            "Accept": "application/json, text/event-stream",
-        }
-
-        if self.mcp_session_id:
-            headers["mcp-session-id"] = self.mcp_session_id
-
-        await self.client.post(self.url, headers=headers, json=notification.model_dump(by_alias=True))
-
     async def disconnect(self):
         """Gracefully close the session and cancel pending Futures."""
         if self.listen_task:
@@ -179,25 +253,18 @@ class StreamableHTTPTransport(BaseTransport):
             finally:
                 self.listen_task = None
 
+        # Cancel pending futures and response streams
+        self.cancel_inflight()
+
         if self.client:
-            headers = {
-                **self.headers,
-                "Content-Type": "application/json",
-                "Accept": "application/json",
-            }
-            if self.mcp_session_id:
-                headers["mcp-session-id"] = self.mcp_session_id
             try:
-                await self.client.delete(self.url, headers=headers)
+                if self.mcp_session_id:
+                    await self.client.delete(self.url, headers=self.get_headers(accept="application/json"), timeout=self.http_timeout, follow_redirects=True)
+            except Exception as e:
+                logger.warning(f"Failed to terminate session: {e}")
             finally:
-                await self.client.aclose()
+                await self.http_pool.release(self.client)
                 self.client = None
 
-        # Cancel pending futures
-        for fut in self.pending.values():
-            if not fut.done():
-                fut.cancel()
-        self.pending.clear()
-
         self.mcp_session_id = None
         self.protocol_version = None
@@ -1,10 +1,12 @@
-from src.mcp.types.json_rpc import JSONRPCRequest, JSONRPCResponse, JSONRPCResultResponse, JSONRPCErrorResponse, JSONRPCError, Error, JSONRPCNotification, JSONRPCMessage
+from src.mcp.types.json_rpc import JSONRPCMessage
+from src.mcp.transport.framing import DEFAULT_MAX_MESSAGE_SIZE
+from src.mcp.transport.writer import MessageWriter
 from src.mcp.exception import MCPError
 from src.mcp.logger import get_logger
-from typing import Optional, Dict
+from websockets.extensions.permessage_deflate import ClientPerMessageDeflateFactory
+from typing import Optional
 import websockets
 import asyncio
-import json
 
 logger = get_logger(__name__)
 
@@ -16,101 +18,100 @@ class WebSocketTransport(BaseTransport):
     """
     WebSocket Transport for MCP
     Uses asyncio.Future for one-shot request/response correlation.
+
+    Incoming messages may be up to `max_message_size` bytes. Keepalive pings
+    are sent every `ping_interval` seconds (None disables them). Messages are
+    compressed with permessage-deflate unless `compression` is None;
+    `compression_level` trades CPU for bandwidth (zlib levels 1-9).
+
+    Outgoing frames are written by a single writer task from a queue of at
+    most `write_queue_size` messages. Senders only wait when the queue is
+    full, which pushes back on callers while the socket is congested.
     """
 
-    def __init__(self, url: str, headers: Optional[dict[str, str]] = None):
+    def __init__(
+        self,
+        url: str,
+        headers: Optional[dict[str, str]] = None,
+        max_message_size: Optional[int] = DEFAULT_MAX_MESSAGE_SIZE,
+        ping_interval: Optional[float] = 20,
+        ping_timeout: Optional[float] = 20,
+        compression: Optional[str] = "deflate",
+        compression_level: Optional[int] = None,
+        write_queue_size: int = 1024,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
         self.url = url
         self.headers = headers or {}
+        self.max_message_size = max_message_size
+        self.ping_interval = ping_interval
+        self.ping_timeout = ping_timeout
+        self.compression = compression
+        self.compression_level = compression_level
+        self.write_queue_size = write_queue_size
         self.websocket: Optional[websockets.ClientConnection] = None
         self.listen_task: Optional[asyncio.Task] = None
-        self.pending: Dict[str, asyncio.Future] = {}  # request.id -> Future
+        self.writer: Optional[MessageWriter] = None
+
+    def get_compression_options(self) -> dict:
+        if self.compression is None:
+            return {"compression": None}
+        if self.compression != "deflate":
+            raise ValueError(f"Unsupported WebSocket compression: {self.compression}")
+        if self.compression_level is None:
+            return {"compression": "deflate"}
+        factory = ClientPerMessageDeflateFactory(
+            client_max_window_bits=True,
+            compress_settings={"level": self.compression_level, "memLevel": 5},
+        )
+        return {"compression": None, "extensions": [factory]}
 
     async def connect(self):
-        """Create a WebSocket client and start listening."""
+        """Create a WebSocket client and start the reader and writer tasks."""
         self.websocket = await websockets.connect(
             self.url,
             additional_headers=self.headers,
             subprotocols=["mcp"],
+            max_size=self.max_message_size,
+            ping_interval=self.ping_interval,
+            ping_timeout=self.ping_timeout,
+            **self.get_compression_options(),
         )
         self.listen_task = asyncio.create_task(self.listen())
+        self.writer = MessageWriter(self.write_frames, self.on_write_error, self.write_queue_size)
+        self.writer.start()
+
+    async def send_message(self, message: JSONRPCMessage):
+        """Queue a JSON-RPC message to be sent as a single WebSocket frame."""
+        if not self.websocket or self.writer is None:
+            raise MCPError(code=-1, message="WebSocket not connected")
+        await self.writer.put(self.codec.encode(message))
 
-    async def send_response(self, response: JSONRPCResponse):
-        """Send a JSON-RPC response."""
-        if not self.websocket:
-             raise MCPError(code=-1, message="WebSocket not connected")
-        await self.websocket.send(json.dumps(response.model_dump(by_alias=True)))
+    async def write_frames(self, batch: list[bytes]) -> None:
+        for data in batch:
+            await self.websocket.send(data, text=True)
+
+    def on_write_error(self, error: Exception) -> None:
+        # Requests still queued or awaiting a response can no longer complete
+        self.connection_lost(f"WebSocket write failed: {error}")
 
     async def listen(self):
         """Listen for JSON-RPC messages from the MCP server."""
         try:
             async for data in self.websocket:
                 try:
-                    content: dict = json.loads(data)
-                    
-                    if "result" in content:
-                        msg_id = content.get("id")
-                        message = JSONRPCResultResponse.model_validate(content)
-                        # Resolve the corresponding pending future
-                        future = self.pending.pop(msg_id, None)
-                        if future and not future.done():
-                             future.set_result(message)
-
-                    elif "method" in content:
-                         message = JSONRPCRequest.model_validate(content)
-                         response = await self.handle_request(message)
-                         await self.send_response(response)
-
-                    elif "error" in content:
-                        msg_id = content.get("id")
-                        err = Error.model_validate(content["error"])
-                        message = JSONRPCErrorResponse(id=msg_id, error=err)
-                        # Resolve the corresponding pending future
-                        future = self.pending.pop(msg_id, None)
-                        if future and not future.done():
-                            future.set_result(message)
-                    else:
-                        # Ignore notifications or invalid messages for now
-                        continue
-
+                    await self.dispatch(self.codec.decode(data))
                 except Exception as e:
                     logger.error(f"Error parsing WebSocket message: {e}", exc_info=True)
 
-        except websockets.exceptions.ConnectionClosed:
-            logger.info("WebSocket connection closed.")
+        except websockets.exceptions.ConnectionClosed as e:
+            self.connection_lost(f"WebSocket connection closed: {e}")
         except Exception as e:
             logger.error(f"WebSocket listen error: {e}", exc_info=True)
-
-    async def send_request(self, request: JSONRPCMessage) -> JSONRPCResponse:
-        """
-        Send a JSON-RPC request and wait for its response.
-        """
-        if not self.websocket:
-            raise MCPError(code=-1, message="WebSocket not connected")
-
-        future = asyncio.get_event_loop().create_future()
-        self.pending[request.id] = future
-
-        await self.websocket.send(json.dumps(request.model_dump(by_alias=True)))
-
-        try:
-            response = await asyncio.wait_for(future, timeout=30)
-        except asyncio.TimeoutError:
-            self.pending.pop(request.id, None)
-            raise MCPError(code=-1, message="Request timed out.")
-
-        if isinstance(response, JSONRPCErrorResponse):
-            raise MCPError(code=response.error.code, message=response.error.message)
-
-        return response
-
-    async def send_notification(self, notification: JSONRPCMessage):
-        """
-        Send a JSON-RPC notification (fire and forget).
-        """
-        if not self.websocket:
-            raise MCPError(code=-1, message="WebSocket not connected")
-
-        await self.websocket.send(json.dumps(notification.model_dump(by_alias=True)))
+            self.connection_lost(f"WebSocket listen error: {e}")
+        else:
+            self.connection_lost("WebSocket connection closed")
 
     async def disconnect(self):
         """Gracefully close the WebSocket connection."""
@@ -123,12 +124,13 @@ class WebSocketTransport(BaseTransport):
             finally:
                 self.listen_task = None
 
+        if self.writer:
+            await self.writer.stop()
+            self.writer = None
+
         if self.websocket:
             await self.websocket.close()
             self.websocket = None
 
         # Cancel any unresolved Futures
-        for fut in self.pending.values():
-            if not fut.done():
-                fut.cancel()
-        self.pending.clear()
+        self.cancel_inflight()
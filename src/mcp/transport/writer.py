@@ -0,0 +1,91 @@
+from src.mcp.exception import ConnectionLost
+from typing import Awaitable, Callable, Optional
+import asyncio
+
+
+class MessageWriter:
+    """
+    Single task writing encoded messages for a transport, in order.
+
+    While the writer is idle, `put` hands a message to `write_now`, which
+    writes it at once unless the peer is behind. Otherwise messages go on a
+    queue of at most `max_queue_size` entries and producers only wait when it
+    is full, so a peer that reads slowly throttles them. The writer hands
+    everything queued since its last write to `write` in one call, letting
+    the transport coalesce messages into a single syscall.
+
+    When `write` raises, the writer stops, `on_error` is called with the
+    exception, and later `put` calls fail instead of blocking.
+    """
+
+    def __init__(self, write: Callable[[list[bytes]], Awaitable[None]], on_error: Callable[[Exception], None], max_queue_size: int = 1024, write_now: Optional[Callable[[bytes], bool]] = None) -> None:
+        self.write = write
+        self.on_error = on_error
+        self.write_now = write_now
+        self.queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=max_queue_size)
+        self.task: Optional[asyncio.Task] = None
+        self.writing = False
+
+    def start(self) -> None:
+        self.task = asyncio.create_task(self.run())
+
+    def running(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+    async def put(self, data: bytes) -> None:
+        '''
+        Queue an encoded message, waiting while the queue is full
+
+        Args:
+            data: The encoded message
+
+        Raises:
+            ConnectionLost: If the writer is not running or stops while waiting
+        '''
+        if not self.running():
+            raise ConnectionLost("Connection closed")
+        # Nothing is ahead of the message, so writing it directly keeps the order
+        if self.write_now is not None and not self.writing and self.queue.empty():
+            try:
+                if self.write_now(data):
+                    return
+            except Exception as e:
+                self.on_error(e)
+                raise ConnectionLost("Connection closed") from e
+        if not self.queue.full():
+            self.queue.put_nowait(data)
+            return
+        # Wait for room in the queue, unless the writer stops for good in the meantime
+        put = asyncio.create_task(self.queue.put(data))
+        try:
+            await asyncio.wait((put, self.task), return_when=asyncio.FIRST_COMPLETED)
+        except asyncio.CancelledError:
+            put.cancel()
+            raise
+        if not put.done():
+            put.cancel()
+            raise ConnectionLost("Connection closed")
+
+    async def run(self) -> None:
+        try:
+            while True:
+                batch = [await self.queue.get()]
+                self.writing = True
+                while not self.queue.empty():
+                    batch.append(self.queue.get_nowait())
+                await self.write(batch)
+                self.writing = False
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.on_error(e)
+
+    async def stop(self) -> None:
+        """Cancel the writer task; queued messages are dropped."""
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, ConfigDict, Field
-from typing import Optional, Any, Literal
+from typing import Optional, Any, Literal, Protocol
 from src.mcp.types.common import RequestId, ProgressToken, NotificationParams
 
 # Cancelled Notification
@@ -37,6 +37,10 @@ class ProgressNotification(BaseModel):
     jsonrpc: Literal["2.0"] = "2.0"
     model_config = ConfigDict(extra='allow')
 
+class ProgressFn(Protocol):
+    async def __call__(self, params: ProgressNotificationParams) -> None:
+        ...
+
 # Task Status Notification relative
 # Note: Task definition is not strictly available in context, treating as generic dictionary mixin for now or just NotificationParams
 # "TaskStatusNotificationParams: NotificationParams & Task"